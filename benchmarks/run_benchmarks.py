@@ -0,0 +1,205 @@
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import cProfile
+import json
+import math
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+from core.generator import generate_dataset
+from core.graph import SensorNetwork
+from core.simulation import Simulation
+
+DATASET_SIZES = [50, 100, 200, 400]
+SYNTHETIC_SIZES = [10_000]
+PER_SENSOR_LIMIT = 400  # next_step com uma busca por sensor é O(n³ log n); acima disso só os modos em árvore
+
+
+def dataset_path(size: int) -> str:
+    return f"data/Cenário 4 - Rede {size}.txt"
+
+
+def write_synthetic_dataset(size: int, file_path: str, seed: int = 0) -> None:
+    # Mesma densidade dos arquivos de 400 motes em 1000 x 1000 m, com a estação base no centro
+    generate_dataset(file_path, size, 'uniform', seed)
+
+
+def loaded_network(file_path: str, use_cache: bool = True) -> SensorNetwork:
+    network = SensorNetwork()
+    network.load_from_file(file_path, use_cache)
+    return network
+
+
+def stages(file_path: str, size: int) -> List[Tuple[str, Callable[[], Callable[[], object]]]]:
+    # Cada estágio devolve a função medida já com o estado preparado, para que o preparo fique fora da medição
+    def load():
+        return lambda: loaded_network(file_path, use_cache=False)
+
+    def load_cached():
+        loaded_network(file_path)
+        return lambda: loaded_network(file_path)
+
+    def build():
+        network = loaded_network(file_path)
+        return network.build_adjacency_matrix
+
+    def dijkstra():
+        network = loaded_network(file_path)
+        return lambda: network.dijkstra(0, reverse=True)
+
+    def prim():
+        network = loaded_network(file_path)
+        return lambda: network.minimum_spanning_tree_prim(0)
+
+    def shortest_path():
+        network = loaded_network(file_path)
+        return lambda: network.get_shortest_path(network.qtd_sensors - 1, 0)
+
+    def next_step(routing_mode: str, accounting: str):
+        def prepare():
+            simulation = Simulation()
+            simulation.create_new_simulation(file_path, 1, 'dijkstra', routing_mode, accounting)
+            return simulation.next_step
+        return prepare
+
+    selected = [
+        ('load_from_file', load),
+        ('load_from_file[cached]', load_cached),
+        ('build_adjacency_matrix', build),
+        ('dijkstra', dijkstra),
+        ('minimum_spanning_tree_prim', prim),
+        ('get_shortest_path', shortest_path),
+        ('next_step[tree]', next_step('tree', 'per_hop')),
+        ('next_step[incremental+batch]', next_step('incremental', 'batch')),
+    ]
+    if size <= PER_SENSOR_LIMIT:
+        selected.append(('next_step[per_sensor]', next_step('per_sensor', 'per_hop')))
+    return selected
+
+
+def measure(prepare: Callable[[], Callable[[], object]], repeats: int, profile_path: Optional[str]) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeats):
+        func = prepare()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # Pico de memória medido numa execução separada, pois o tracemalloc deixa o código bem mais lento
+    func = prepare()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if profile_path is not None:
+        func = prepare()
+        profiler = cProfile.Profile()
+        profiler.runcall(func)
+        profiler.dump_stats(profile_path)
+
+    return {'wall_time': min(timings), 'peak_memory': peak}
+
+
+def scaling_exponents(results: Dict[str, Dict[str, Dict[str, float]]]) -> Dict[str, float]:
+    # Inclinação do ajuste por mínimos quadrados de log(tempo) contra log(n)
+    exponents = {}
+    stage_names = {stage for per_size in results.values() for stage in per_size}
+    for stage in sorted(stage_names):
+        points = [
+            (math.log(int(size)), math.log(per_size[stage]['wall_time']))
+            for size, per_size in results.items()
+            if stage in per_size and per_size[stage]['wall_time'] > 0
+        ]
+        if len(points) < 2:
+            continue
+        mean_x = sum(x for x, _ in points) / len(points)
+        mean_y = sum(y for _, y in points) / len(points)
+        variance = sum((x - mean_x) ** 2 for x, _ in points)
+        if variance > 0:
+            exponents[stage] = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+    return exponents
+
+
+def compare(report: Dict[str, object], baseline: Dict[str, object], tolerance: float) -> List[str]:
+    regressions = []
+    for size, per_size in report['results'].items():
+        for stage, metrics in per_size.items():
+            reference = baseline.get('results', {}).get(size, {}).get(stage)
+            if reference is None or reference['wall_time'] <= 0:
+                continue
+            ratio = metrics['wall_time'] / reference['wall_time']
+            status = "REGRESSÃO" if ratio > 1 + tolerance else "ok"
+            print(f"{size:>7} {stage:<30} {ratio:6.2f}x  {status}")
+            if status != "ok":
+                regressions.append(f"{size}/{stage}")
+    return regressions
+
+
+def run(sizes: List[int], synthetic_sizes: List[int], repeats: int, profile_dir: Optional[str]) -> Dict[str, object]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        inputs = [(size, dataset_path(size)) for size in sizes]
+        for size in synthetic_sizes:
+            file_path = os.path.join(workdir, f"synthetic_{size}.txt")
+            write_synthetic_dataset(size, file_path)
+            inputs.append((size, file_path))
+
+        for size, file_path in inputs:
+            results[str(size)] = {}
+            for stage, prepare in stages(file_path, size):
+                profile_path = None
+                if profile_dir is not None:
+                    profile_path = os.path.join(profile_dir, f"{size}_{stage}.prof")
+
+                with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                    metrics = measure(prepare, repeats, profile_path)
+
+                results[str(size)][stage] = metrics
+                print(f"{size:>7} {stage:<30} {metrics['wall_time'] * 1000:10.2f} ms {metrics['peak_memory'] / 1024:10.1f} KiB")
+
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeats': repeats,
+        'results': results,
+        'scaling_exponents': scaling_exponents(results),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede carga, roteamento e épocas de simulação da RSSF.")
+    parser.add_argument('--sizes', type=int, nargs='*', default=DATASET_SIZES)
+    parser.add_argument('--synthetic', type=int, nargs='*', default=SYNTHETIC_SIZES)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', default=None, help="grava o relatório em JSON para servir de baseline")
+    parser.add_argument('--baseline', default=None, help="compara com um relatório JSON gravado antes")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--profile-dir', default=None, help="grava um dump do cProfile por estágio")
+    args = parser.parse_args()
+
+    if args.profile_dir is not None:
+        os.makedirs(args.profile_dir, exist_ok=True)
+
+    report = run(args.sizes, args.synthetic, args.repeats, args.profile_dir)
+
+    print("\nExpoentes de escala (tempo ~ n^k):")
+    for stage, exponent in report['scaling_exponents'].items():
+        print(f"  {stage:<30} k = {exponent:.2f}")
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        print("\nComparação com a baseline:")
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            raise SystemExit(f"{len(regressions)} estágios mais lentos que a baseline.")
@@ -0,0 +1,109 @@
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from itertools import product
+from random import Random
+from typing import Dict, Iterable, List, Optional, Tuple
+import argparse
+import csv
+import os
+import time
+
+from core.graph import SensorNetwork
+from core.simulation import Simulation
+from core.strategies import get_strategy
+
+# Redes já carregadas por este processo; cada job trabalha sobre uma cópia com baterias próprias
+_NETWORKS: Dict[str, SensorNetwork] = {}
+
+
+def load_shared_network(dataset_path: str) -> SensorNetwork:
+    network = _NETWORKS.get(dataset_path)
+    if network is None:
+        network = SensorNetwork()
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            if not network.load_from_file(dataset_path):
+                raise ValueError(f"Não foi possível carregar {dataset_path}.")
+        _NETWORKS[dataset_path] = network
+    return network.copy()
+
+
+def run_job(job: Tuple[str, str, int, str, int, float]) -> Dict[str, object]:
+    dataset_path, algorithm, seed, runner, rounds, compression_ratio = job
+    network = load_shared_network(dataset_path)
+    start = time.perf_counter()
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        if runner == 'agm':
+            summary = network.run_simulation_agm(rounds, algorithm, Random(seed))
+        elif runner == 'simulation':
+            # A semente alimenta as estratégias aleatórias (eleição de líderes do LEACH)
+            network.rng = Random(seed)
+            simulation = Simulation()
+            simulation.use_network(network, rounds, algorithm, 'incremental', 'batch', compression_ratio=compression_ratio)
+            simulation.run_simulation(rounds)
+            summary = {'rounds': simulation.current_epoch, 'compression_ratio': compression_ratio}
+        else:
+            raise ValueError(f"Executor desconhecido: {runner}")
+
+    batteries = [network.store.battery[sensor_id] for sensor_id in network.mote_ids]
+    row = {
+        'dataset': os.path.basename(dataset_path),
+        'algorithm': algorithm,
+        'seed': seed,
+        'runner': runner,
+        'dead_sensors': sum(1 for battery in batteries if battery <= 0),
+        'residual_energy': sum(battery for battery in batteries if battery > 0),
+        'min_battery': min(batteries, default=0.0),
+        'elapsed': time.perf_counter() - start,
+    }
+    row.update(summary)
+    return row
+
+
+def build_jobs(datasets: Iterable[str], algorithms: Iterable[str], seeds: Iterable[int], runner: str = 'agm', rounds: int = 400, compression_ratio: float = 1.0) -> List[Tuple[str, str, int, str, int, float]]:
+    # Agrupados por dataset para que cada processo reaproveite a rede já carregada. No executor 'simulation'
+    # a semente só muda o resultado de estratégias aleatórias; as demais rodam uma única vez.
+    seeds = list(seeds)
+    return [
+        (dataset, algorithm, seed, runner, rounds, compression_ratio)
+        for dataset, algorithm in product(datasets, algorithms)
+        for seed in (seeds if runner != 'simulation' or get_strategy(algorithm).randomized else seeds[:1])
+    ]
+
+
+def run_batch(jobs: List[Tuple[str, str, int, str, int, float]], max_workers: Optional[int] = None) -> List[Dict[str, object]]:
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_job, jobs, chunksize=chunksize))
+
+
+def write_csv(rows: List[Dict[str, object]], file_path: str) -> None:
+    if not rows:
+        return
+
+    with open(file_path, 'w', newline='') as file:
+        fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Executa simulações de Monte-Carlo em paralelo.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200, 400])
+    parser.add_argument('--algorithms', nargs='+', default=['dijkstra', 'minimum_spanning_tree_prim'])
+    parser.add_argument('--seeds', type=int, default=10)
+    parser.add_argument('--runner', choices=['agm', 'simulation'], default='agm')
+    parser.add_argument('--rounds', type=int, default=400)
+    parser.add_argument('--compression-ratio', type=float, default=1.0, help="agregação de dados no executor 'simulation' (1.0 = sem agregação)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', default='batch_results.csv')
+    args = parser.parse_args()
+
+    datasets = [f"data/Cenário 4 - Rede {size}.txt" for size in args.sizes]
+    jobs = build_jobs(datasets, args.algorithms, range(args.seeds), args.runner, args.rounds, args.compression_ratio)
+    rows = run_batch(jobs, args.workers)
+    write_csv(rows, args.output)
+    print(f"{len(rows)} simulações gravadas em {args.output}.")
@@ -0,0 +1,184 @@
+from array import array
+from random import Random
+from typing import BinaryIO, Dict, List, Optional, Tuple
+import json
+import os
+import struct
+
+from core.graph import SensorNetwork
+from core.network_cache import byteorder_flag, file_digest, write_atomically
+from core.routing import IncrementalRoutingTree
+
+CHECKPOINT_MAGIC = b'RSSK'
+CHECKPOINT_VERSION = 1
+
+# magic, versão, ordem dos bytes, época, rodada da rede, quantidade de sensores, tamanho dos metadados
+HEADER = struct.Struct('<4sIBqqqI')
+
+
+def _encode_value(name: str, value, sections: List[Tuple[str, array]]) -> Dict[str, object]:
+    # Vetores vão para o bloco binário; valores simples ficam nos metadados
+    if isinstance(value, Random):
+        version, internal_state, gauss_next = value.getstate()
+        sections.append((name, array('I', internal_state)))
+        return {'kind': 'random', 'version': version, 'gauss_next': gauss_next}
+    if isinstance(value, array):
+        sections.append((name, value))
+        return {'kind': 'array'}
+    if isinstance(value, (bytes, bytearray)):
+        sections.append((name, array('B', value)))
+        return {'kind': 'bytes'}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return {'kind': 'value', 'value': value}
+    raise ValueError(f"Valor não suportado no checkpoint: {name}")
+
+
+def _decode_value(name: str, description: Dict[str, object], sections: Dict[str, array]):
+    kind = description['kind']
+    if kind == 'random':
+        rng = Random()
+        rng.setstate((description['version'], tuple(sections[name]), description['gauss_next']))
+        return rng
+    if kind == 'array':
+        return sections[name]
+    if kind == 'bytes':
+        return bytearray(sections[name])
+    return description['value']
+
+
+def _tree_array(parents: List[Optional[int]]) -> array:
+    return array('i', [-1 if parent_id is None else parent_id for parent_id in parents])
+
+
+def _tree_list(parents: array) -> List[Optional[int]]:
+    return [None if parent_id == -1 else parent_id for parent_id in parents]
+
+
+def _dataset_digest(simulation) -> str:
+    if simulation.dataset_digest is None:
+        simulation.dataset_digest = file_digest(simulation.dataset_path)
+    return simulation.dataset_digest
+
+
+def write_checkpoint(simulation, checkpoint_path: str, rng: Optional[Random] = None) -> None:
+    # Só o estado que muda durante a simulação é gravado; a topologia vem do dataset (e do cache da rede)
+    network = simulation.network
+    if network is None or simulation.dataset_path is None:
+        raise ValueError("O checkpoint exige uma simulação criada a partir de um dataset.")
+
+    sections: List[Tuple[str, array]] = [
+        ('battery', network.store.battery),
+        ('active', array('B', network.active)),
+        ('routing_parents', _tree_array(simulation.routing_parents)),
+    ]
+    if simulation.routing_tree is not None:
+        sections.append(('tree_parents', _tree_array(simulation.routing_tree.parents)))
+        sections.append(('tree_costs', array('d', simulation.routing_tree.costs)))
+
+    metadata = {
+        'dataset_path': os.path.abspath(simulation.dataset_path),
+        'dataset_digest': _dataset_digest(simulation),
+        'epochs': simulation.epochs,
+        'algorithm': simulation.algorithm,
+        'routing_mode': simulation.routing_mode,
+        'accounting': simulation.accounting,
+        'compression_ratio': simulation.compression_ratio,
+        'strategy_state': {
+            strategy: {key: _encode_value(f"strategy.{strategy}.{key}", value, sections) for key, value in state.items()}
+            for strategy, state in network.strategy_state.items()
+        },
+        'rng': _encode_value('rng', rng, sections) if rng is not None else None,
+        'network_rng': _encode_value('network_rng', network.rng, sections),
+    }
+    metadata['sections'] = [[name, values.typecode, len(values)] for name, values in sections]
+    encoded_metadata = json.dumps(metadata).encode('utf-8')
+
+    def write(file: BinaryIO) -> None:
+        file.write(HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, byteorder_flag(), simulation.current_epoch, network.current_round, len(network.sensors), len(encoded_metadata)))
+        file.write(encoded_metadata)
+        for _, values in sections:
+            values.tofile(file)
+
+    write_atomically(checkpoint_path, write)
+
+
+def _read_sections(file: BinaryIO, descriptions: List[List]) -> Dict[str, array]:
+    sections = {}
+    for name, typecode, count in descriptions:
+        values = array(typecode)
+        if count:
+            values.fromfile(file, count)
+        sections[name] = values
+    return sections
+
+
+def _base_network(simulation, metadata: Dict[str, object], size: int) -> Optional[SensorNetwork]:
+    # Se a simulação já tem a mesma rede carregada, o fork compartilha a topologia em vez de recarregá-la
+    network = simulation.network
+    if network is not None and len(network.sensors) == size and simulation.dataset_path is not None:
+        if _dataset_digest(simulation) == metadata['dataset_digest']:
+            return network.copy()
+
+    dataset_path = metadata['dataset_path']
+    try:
+        if file_digest(dataset_path) != metadata['dataset_digest']:
+            print("O dataset foi alterado desde o checkpoint.")
+            return None
+    except OSError:
+        print("Dataset do checkpoint não encontrado.")
+        return None
+
+    network = SensorNetwork()
+    if not network.load_from_file(dataset_path) or len(network.sensors) != size:
+        return None
+    return network
+
+
+def read_checkpoint(simulation, checkpoint_path: str, rng: Optional[Random] = None) -> bool:
+    try:
+        with open(checkpoint_path, 'rb') as file:
+            header = file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                return False
+
+            magic, version, byteorder, epoch, current_round, size, metadata_size = HEADER.unpack(header)
+            if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION or byteorder != byteorder_flag():
+                return False
+
+            metadata = json.loads(file.read(metadata_size).decode('utf-8'))
+            sections = _read_sections(file, metadata['sections'])
+    except (OSError, EOFError, ValueError, struct.error):
+        return False
+
+    network = _base_network(simulation, metadata, size)
+    if network is None:
+        return False
+
+    network.store.battery = sections['battery']
+    network.active = bytearray(sections['active'])
+    network.current_round = current_round
+    network.strategy_state = {
+        strategy: {key: _decode_value(f"strategy.{strategy}.{key}", description, sections) for key, description in state.items()}
+        for strategy, state in metadata['strategy_state'].items()
+    }
+    network.rng = _decode_value('network_rng', metadata['network_rng'], sections)
+    # Os nós ativos mudaram em relação à rede de origem: as rotas guardadas deixam de valer
+    network.topology_version += 1
+
+    routing_tree = None
+    if 'tree_parents' in sections:
+        routing_tree = IncrementalRoutingTree.from_state(network, None, metadata['algorithm'], _tree_list(sections['tree_parents']), sections['tree_costs'])
+
+    if not simulation.use_network(network, metadata['epochs'], metadata['algorithm'], metadata['routing_mode'], metadata['accounting'], routing_tree, metadata['compression_ratio']):
+        return False
+
+    simulation.dataset_path = metadata['dataset_path']
+    simulation.dataset_digest = metadata['dataset_digest']
+    simulation.current_epoch = epoch
+    simulation.routing_parents = _tree_list(sections['routing_parents'])
+    if simulation.routing_parents:
+        simulation.current_paths = network.routes_from_tree(simulation.routing_parents)
+
+    if rng is not None and metadata['rng'] is not None:
+        rng.setstate(_decode_value('rng', metadata['rng'], sections).getstate())
+    return True
@@ -0,0 +1,55 @@
+from typing import List
+
+
+class ConnectivityIndex:
+    # Sensores que ainda alcançam alguma estação base, recalculados só quando a topologia muda.
+    # Os enlaces são direcionados (alcance do emissor), então a busca parte das estações base no grafo reverso.
+    def __init__(self, network):
+        self.network = network
+        self.version = None
+        self.reachable = bytearray()
+        self.reachable_motes = 0
+
+    def copy(self, network) -> 'ConnectivityIndex':
+        index = ConnectivityIndex(network)
+        index.version = self.version
+        index.reachable = bytearray(self.reachable)
+        index.reachable_motes = self.reachable_motes
+        return index
+
+    def refresh(self) -> bytearray:
+        network = self.network
+        if self.version == network.topology_version and len(self.reachable) == len(network.sensors):
+            return self.reachable
+
+        reverse_links, active = network.reverse_links, network.active
+        indices = reverse_links.indices
+        reachable = bytearray(len(network.sensors))
+        queue = [sensor_id for sensor_id in network.base_station_ids if active[sensor_id]]
+        base_stations = len(queue)
+        for sensor_id in queue:
+            reachable[sensor_id] = 1
+
+        for receiver_id in queue:
+            for edge in reverse_links.neighbors(receiver_id):
+                sender_id = indices[edge]
+                if not reachable[sender_id] and active[sender_id]:
+                    reachable[sender_id] = 1
+                    queue.append(sender_id)
+
+        self.reachable = reachable
+        self.reachable_motes = len(queue) - base_stations
+        self.version = network.topology_version
+        return reachable
+
+    def is_reachable(self, sensor_id: int) -> bool:
+        return bool(self.refresh()[sensor_id])
+
+    def reachable_mote_ids(self) -> List[int]:
+        reachable, is_base_station = self.refresh(), self.network.store.is_base_station
+        return [sensor_id for sensor_id, flag in enumerate(reachable) if flag and not is_base_station[sensor_id]]
+
+    def sink_isolated(self) -> bool:
+        # Nenhum mote vivo consegue entregar dados a uma estação base
+        self.refresh()
+        return self.reachable_motes == 0
@@ -0,0 +1,56 @@
+from array import array
+from typing import BinaryIO, List, Optional, Sequence, Tuple
+import os
+import struct
+
+from core.network_cache import byteorder_flag
+
+DATASET_MAGIC = b'RSSD'
+DATASET_VERSION = 1
+
+# magic, versão, ordem dos bytes, quantidade de motes, quantidade de estações base
+HEADER = struct.Struct('<4sIBqq')
+
+# Cada sensor ocupa uma linha de doubles: x, y, alcance, bateria (estações base primeiro, como no texto)
+ROW_WIDTH = 4
+
+
+def is_binary_dataset(file_path: str) -> bool:
+    with open(file_path, 'rb') as file:
+        return file.read(len(DATASET_MAGIC)) == DATASET_MAGIC
+
+
+def write_header(file: BinaryIO, motes: int, base_stations: int) -> None:
+    file.write(HEADER.pack(DATASET_MAGIC, DATASET_VERSION, byteorder_flag(), motes, base_stations))
+
+
+def write_rows(file: BinaryIO, x: Sequence[float], y: Sequence[float], range_radius: Sequence[float], battery: Sequence[float]) -> None:
+    rows = array('d', bytes(8 * ROW_WIDTH * len(x)))
+    for column, values in enumerate((x, y, range_radius, battery)):
+        rows[column::ROW_WIDTH] = array('d', values)
+    rows.tofile(file)
+
+
+def read_binary_dataset(file_path: str) -> Optional[Tuple[int, int, List[array]]]:
+    # Devolve (motes, estações base, [x, y, alcance, bateria]) ou None se o arquivo estiver corrompido
+    try:
+        with open(file_path, 'rb') as file:
+            header = file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                return None
+
+            magic, version, byteorder, motes, base_stations = HEADER.unpack(header)
+            if magic != DATASET_MAGIC or version != DATASET_VERSION or byteorder != byteorder_flag():
+                return None
+
+            # Arquivo cortado no meio de uma linha ou com bytes sobrando é rejeitado
+            count = ROW_WIDTH * (motes + base_stations)
+            if motes < 0 or base_stations < 0 or os.fstat(file.fileno()).st_size != HEADER.size + 8 * count:
+                return None
+
+            rows = array('d')
+            rows.fromfile(file, count)
+    except (OSError, EOFError, ValueError, struct.error):
+        return None
+
+    return motes, base_stations, [rows[column::ROW_WIDTH] for column in range(ROW_WIDTH)]
@@ -0,0 +1,69 @@
+from array import array
+from typing import List, Optional, Sequence
+
+from core.graph import SensorNetwork
+
+
+class BatchEnergyModel:
+    def __init__(self, network: SensorNetwork, root_ids: Optional[Sequence[int]] = None, compression_ratio: float = 1.0):
+        if not 0.0 <= compression_ratio <= 1.0:
+            raise ValueError("A taxa de compressão deve estar entre 0 e 1.")
+
+        self.network = network
+        self.root_ids = list(network.base_station_ids if root_ids is None else root_ids)
+        # Fração dos dados recebidos que cada nó repassa ao agregar com o seu próprio pacote:
+        # 1.0 encaminha tudo sem agregação, 0.0 funde tudo num único pacote
+        self.compression_ratio = compression_ratio
+
+    def traversal_order(self, parents: List[Optional[int]]) -> List[int]:
+        # Ordem em largura a partir das raízes: todo nó aparece depois do seu próximo salto
+        children: List[List[int]] = [[] for _ in parents]
+        for sensor_id, parent_id in enumerate(parents):
+            if parent_id is not None:
+                children[parent_id].append(sensor_id)
+
+        order = list(self.root_ids)
+        for sensor_id in order:
+            order.extend(children[sensor_id])
+        return order
+
+    def packet_loads(self, parents: List[Optional[int]]) -> array:
+        # Pacotes de k bits que cada nó transmite na época: o seu mais o que recebe dos filhos, reduzido
+        # pela agregação; de baixo para cima, a carga de um nó já está completa quando ele é visitado
+        loads = array('d', bytes(8 * len(parents)))
+        order = self.traversal_order(parents)
+        compression_ratio = self.compression_ratio
+
+        for sensor_id in reversed(order):
+            if parents[sensor_id] is None:
+                continue
+            loads[sensor_id] = 1.0 + compression_ratio * loads[sensor_id]
+            loads[parents[sensor_id]] += loads[sensor_id]
+        return loads
+
+    def epoch_drain(self, parents: List[Optional[int]]) -> array:
+        links = self.network.links
+        loads = self.packet_loads(parents)
+        drain = array('d', bytes(8 * len(parents)))
+
+        for sensor_id, parent_id in enumerate(parents):
+            if parent_id is None or not loads[sensor_id]:
+                continue
+            edge = links.edge_index(sensor_id, parent_id)
+            drain[sensor_id] += loads[sensor_id] * links.tx_energy[edge]
+            drain[parent_id] += loads[sensor_id] * links.rx_energy[edge]
+        return drain
+
+    def apply_epoch(self, parents: List[Optional[int]]) -> List[int]:
+        drain = self.epoch_drain(parents)
+        store, active = self.network.store, self.network.active
+        batteries, is_base_station = store.battery, store.is_base_station
+
+        depleted = []
+        for sensor_id, energy in enumerate(drain):
+            if not energy or is_base_station[sensor_id]:
+                continue
+            batteries[sensor_id] -= energy
+            if batteries[sensor_id] <= 0 and active[sensor_id]:
+                depleted.append(sensor_id)
+        return depleted
@@ -0,0 +1,333 @@
+from array import array
+from itertools import count as count_from
+from random import Random
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+import argparse
+import math
+
+from core.dataset_format import write_header, write_rows
+
+DEFAULT_RANGE = 100.0
+DEFAULT_BATTERY = 1.0
+CHUNK_SIZE = 65536
+
+# Densidade dos arquivos de data/: 400 motes em 1000 x 1000 m
+REFERENCE_SIZE = 400
+REFERENCE_SIDE = 1000.0
+
+# Espaçamento dos relays inseridos para ligar componentes isolados, em relação ao alcance
+# (abaixo de 1 para que o arredondamento nunca deixe dois relays vizinhos fora de alcance)
+RELAY_SPACING_FRACTION = 0.95
+
+# Poisson-disk: um ponto por célula, a pelo menos esta fração do lado da célula dos vizinhos
+POISSON_DISTANCE_FRACTION = 0.5
+POISSON_ATTEMPTS = 30
+
+Chunk = Tuple[array, array]
+Deployment = Callable[..., Iterator[Chunk]]
+
+
+def side_for(size: int) -> float:
+    return REFERENCE_SIDE * math.sqrt(size / REFERENCE_SIZE)
+
+
+def uniform_points(count: int, side: float, rng: Random, chunk_size: int = CHUNK_SIZE) -> Iterator[Chunk]:
+    for start in range(0, count, chunk_size):
+        x, y = array('d'), array('d')
+        for _ in range(min(chunk_size, count - start)):
+            x.append(rng.uniform(0, side))
+            y.append(rng.uniform(0, side))
+        yield x, y
+
+
+def clustered_points(count: int, side: float, rng: Random, chunk_size: int = CHUNK_SIZE, clusters: Optional[int] = None, spread: Optional[float] = None) -> Iterator[Chunk]:
+    # Processo de Thomas: centros uniformes e motes espalhados em torno deles com desvio `spread`
+    clusters = clusters or max(1, count // 200)
+    spread = spread or side / (4 * math.sqrt(clusters))
+    centers = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(clusters)]
+
+    for start in range(0, count, chunk_size):
+        x, y = array('d'), array('d')
+        for _ in range(min(chunk_size, count - start)):
+            center_x, center_y = centers[rng.randrange(clusters)]
+            x.append(min(max(rng.gauss(center_x, spread), 0.0), side))
+            y.append(min(max(rng.gauss(center_y, spread), 0.0), side))
+        yield x, y
+
+
+def poisson_disk_points(count: int, side: float, rng: Random, chunk_size: int = CHUNK_SIZE) -> Iterator[Chunk]:
+    # Amostragem linha a linha de células: cada célula recebe um ponto afastado dos vizinhos já gerados,
+    # então só a linha anterior precisa ficar em memória
+    columns = max(1, math.ceil(math.sqrt(count)))
+    cell = side / columns
+    min_distance = POISSON_DISTANCE_FRACTION * cell
+    previous_row: List[Tuple[float, float]] = []
+    current_row: List[Tuple[float, float]] = []
+    x, y = array('d'), array('d')
+
+    for index in range(count):
+        row, column = divmod(index, columns)
+        if column == 0:
+            previous_row, current_row = current_row, []
+
+        neighbors = previous_row[max(0, column - 1):column + 2] + current_row[-1:]
+        best, best_distance = None, -1.0
+        for _ in range(POISSON_ATTEMPTS):
+            candidate = ((column + rng.random()) * cell, (row + rng.random()) * cell)
+            distance = min((math.dist(candidate, neighbor) for neighbor in neighbors), default=math.inf)
+            if distance > best_distance:
+                best, best_distance = candidate, distance
+            if distance >= min_distance:
+                break
+
+        current_row.append(best)
+        x.append(best[0])
+        y.append(best[1])
+        if len(x) == chunk_size:
+            yield x, y
+            x, y = array('d'), array('d')
+
+    if x:
+        yield x, y
+
+
+DEPLOYMENTS: Dict[str, Deployment] = {
+    'uniform': uniform_points,
+    'clustered': clustered_points,
+    'poisson_disk': poisson_disk_points,
+}
+
+
+def _find(parents: array, node: int) -> int:
+    root = node
+    while parents[root] != root:
+        root = parents[root]
+    while parents[node] != root:
+        parents[node], node = root, parents[node]
+    return root
+
+
+def _union(parents: array, node_a: int, node_b: int) -> None:
+    root_a, root_b = _find(parents, node_a), _find(parents, node_b)
+    if root_a != root_b:
+        parents[max(root_a, root_b)] = min(root_a, root_b)
+
+
+class _RelayPlanner:
+    # Componentes conexos dos pontos (todos com o mesmo alcance, enlaces simétricos) via union-find
+    # sobre uma grade de células de lado pelo menos igual ao alcance; os índices 0..sinks-1 são as
+    # estações base. A grade é compacta: os índices dos pontos ficam ordenados por célula num único
+    # array (counting sort) e cada célula guarda só o deslocamento do seu trecho.
+    def __init__(self, x: array, y: array, sinks: int, range_radius: float):
+        self.x, self.y = x, y
+        self.range_radius = range_radius
+        self.parents = array('i', range(len(x)))
+
+        # Em redes esparsas as células crescem para que a grade nunca tenha mais células que pontos
+        self.min_x, self.min_y = min(x), min(y)
+        width, height = max(x) - self.min_x, max(y) - self.min_y
+        self.cell_size = max(range_radius, max(width, height) / math.sqrt(len(x)))
+        self.columns = math.floor(width / self.cell_size) + 1
+        self.rows = math.floor(height / self.cell_size) + 1
+        self.extent = max(self.columns, self.rows)
+
+        self.offsets = array('q', bytes(8 * (self.columns * self.rows + 1)))
+        for index in range(len(x)):
+            self.offsets[self.cell_index(*self.cell_of(x[index], y[index])) + 1] += 1
+        for cell in range(1, len(self.offsets)):
+            self.offsets[cell] += self.offsets[cell - 1]
+        self.order = array('i', bytes(4 * len(x)))
+        filled = array('q', self.offsets[:-1])
+        for index in range(len(x)):
+            cell = self.cell_index(*self.cell_of(x[index], y[index]))
+            self.order[filled[cell]] = index
+            filled[cell] += 1
+        del filled
+
+        # Relays acrescentados depois da ordenação; são poucos, então ficam num dicionário à parte
+        self.added_cells: Dict[int, List[int]] = {}
+
+        for cell_x in range(self.columns):
+            for cell_y in range(self.rows):
+                members = self.members(cell_x, cell_y)
+                if not members:
+                    continue
+                for offset_x, offset_y in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+                    others = members if (offset_x, offset_y) == (0, 0) else self.members(cell_x + offset_x, cell_y + offset_y)
+                    for position, index in enumerate(members):
+                        candidates = members[position + 1:] if others is members else others
+                        for other in candidates:
+                            if self.in_range(index, other):
+                                _union(self.parents, index, other)
+
+        # Qualquer estação base serve como destino: todas contam como um único componente
+        for sink in range(1, sinks):
+            _union(self.parents, 0, sink)
+
+    def cell_of(self, px: float, py: float) -> Tuple[int, int]:
+        return (math.floor((px - self.min_x) / self.cell_size), math.floor((py - self.min_y) / self.cell_size))
+
+    def cell_index(self, cell_x: int, cell_y: int) -> int:
+        return cell_x * self.rows + cell_y
+
+    def members(self, cell_x: int, cell_y: int) -> Sequence[int]:
+        if not (0 <= cell_x < self.columns and 0 <= cell_y < self.rows):
+            return ()
+        cell = self.cell_index(cell_x, cell_y)
+        members = self.order[self.offsets[cell]:self.offsets[cell + 1]]
+        added = self.added_cells.get(cell)
+        return members + array('i', added) if added else members
+
+    def in_range(self, index_a: int, index_b: int) -> bool:
+        # Mesma conta de SpatialGrid.query, para que o enlace exista de fato ao carregar a rede
+        x, y = self.x, self.y
+        return math.sqrt((x[index_a] - x[index_b]) ** 2 + (y[index_a] - y[index_b]) ** 2) <= self.range_radius
+
+    def add_point(self, px: float, py: float) -> int:
+        index = len(self.x)
+        self.x.append(px)
+        self.y.append(py)
+        self.parents.append(index)
+        cell_x, cell_y = self.cell_of(px, py)
+        for offset_x in (-1, 0, 1):
+            for offset_y in (-1, 0, 1):
+                for other in self.members(cell_x + offset_x, cell_y + offset_y):
+                    if self.in_range(index, other):
+                        _union(self.parents, index, other)
+        self.added_cells.setdefault(self.cell_index(cell_x, cell_y), []).append(index)
+        return index
+
+    @staticmethod
+    def ring_cells(cell_x: int, cell_y: int, ring: int) -> Iterator[Tuple[int, int]]:
+        if ring == 0:
+            yield cell_x, cell_y
+            return
+        for offset in range(-ring, ring + 1):
+            yield cell_x + offset, cell_y - ring
+            yield cell_x + offset, cell_y + ring
+        for offset in range(-ring + 1, ring):
+            yield cell_x - ring, cell_y + offset
+            yield cell_x + ring, cell_y + offset
+
+    def nearest_pair(self, members: List[int]) -> Tuple[int, int, float]:
+        # Busca em anéis de células em volta de cada célula do componente, parando quando o anel já
+        # está além do melhor par encontrado
+        x, y, parents = self.x, self.y, self.parents
+        sink_root = _find(parents, 0)
+        by_cell: Dict[Tuple[int, int], List[int]] = {}
+        for index in members:
+            by_cell.setdefault(self.cell_of(x[index], y[index]), []).append(index)
+
+        best = (-1, -1, math.inf)
+        for (cell_x, cell_y), sources in by_cell.items():
+            for ring in count_from():
+                if ring > self.extent or (ring - 1) * self.cell_size > best[2]:
+                    break
+                for cell in self.ring_cells(cell_x, cell_y, ring):
+                    for other in self.members(*cell):
+                        if _find(parents, other) != sink_root:
+                            continue
+                        for index in sources:
+                            distance = math.dist((x[index], y[index]), (x[other], y[other]))
+                            if distance < best[2]:
+                                best = (index, other, distance)
+        return best
+
+    def connect(self) -> int:
+        # Cada componente isolado é ligado ao componente das estações base pelo par de pontos mais
+        # próximo, com o menor número de relays em linha reta; componentes mais perto da primeira
+        # estação base vêm primeiro, para que os seguintes possam se ligar através deles
+        sink_root = _find(self.parents, 0)
+        components: Dict[int, List[int]] = {}
+        for index in range(len(self.x)):
+            root = _find(self.parents, index)
+            if root != sink_root:
+                components.setdefault(root, []).append(index)
+
+        sink_x, sink_y = self.x[0], self.y[0]
+        order = sorted(components.values(), key=lambda members: min(math.dist((self.x[index], self.y[index]), (sink_x, sink_y)) for index in members))
+        added = 0
+
+        for members in order:
+            if _find(self.parents, members[0]) == _find(self.parents, 0):
+                continue
+
+            source, target, distance = self.nearest_pair(members)
+            relays = math.ceil(distance / (RELAY_SPACING_FRACTION * self.range_radius)) - 1
+            start_x, start_y = self.x[source], self.y[source]
+            end_x, end_y = self.x[target], self.y[target]
+            for step in range(1, relays + 1):
+                fraction = step / (relays + 1)
+                self.add_point(start_x + (end_x - start_x) * fraction, start_y + (end_y - start_y) * fraction)
+            added += relays
+        return added
+
+
+def add_relays(x: array, y: array, sinks: int, range_radius: float) -> int:
+    # Acrescenta a x e y os relays necessários para que todo mote alcance uma estação base
+    return _RelayPlanner(x, y, sinks, range_radius).connect()
+
+
+def _write_text_rows(file: TextIO, x: array, y: array, range_radius: float) -> None:
+    # Alcance só é gravado quando difere do padrão do leitor, mantendo o formato "x, y" dos arquivos de data/
+    if range_radius == DEFAULT_RANGE:
+        file.write(''.join(f"{px}, {py}\n" for px, py in zip(x, y)))
+    else:
+        file.write(''.join(f"{px}, {py}, {range_radius}\n" for px, py in zip(x, y)))
+
+
+def generate_dataset(file_path: str, size: int, deployment: str = 'uniform', seed: int = 0, connected: bool = False, base_stations: int = 1, range_radius: float = DEFAULT_RANGE, binary: bool = False, side: Optional[float] = None, chunk_size: int = CHUNK_SIZE) -> int:
+    points = DEPLOYMENTS.get(deployment)
+    if points is None:
+        raise ValueError(f"Distribuição desconhecida: {deployment}")
+
+    rng = Random(seed)
+    side = side_for(size) if side is None else side
+
+    # A primeira estação base fica no centro, como nos arquivos de data/; as demais são sorteadas
+    sinks = [(side / 2, side / 2)] + [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(base_stations - 1)]
+    sink_x, sink_y = array('d', [x for x, _ in sinks]), array('d', [y for _, y in sinks])
+
+    chunks = points(size, side, rng, chunk_size)
+    if connected:
+        # Os relays dependem de todos os pontos, então as coordenadas e a grade compacta do _RelayPlanner ficam
+        # em memória (cerca de 40 bytes por mote, medidos com 200 mil motes);
+        # os relays entram depois dos motes sorteados e somam-se a `size`
+        x, y = array('d', sink_x), array('d', sink_y)
+        for chunk_x, chunk_y in chunks:
+            x.extend(chunk_x)
+            y.extend(chunk_y)
+        size += add_relays(x, y, base_stations, range_radius)
+        chunks = ((x[start:start + chunk_size], y[start:start + chunk_size]) for start in range(base_stations, len(x), chunk_size))
+
+    if binary:
+        with open(file_path, 'wb') as file:
+            write_header(file, size, base_stations)
+            write_rows(file, sink_x, sink_y, [range_radius] * base_stations, [float('inf')] * base_stations)
+            for x, y in chunks:
+                write_rows(file, x, y, array('d', [range_radius]) * len(x), array('d', [DEFAULT_BATTERY]) * len(x))
+    else:
+        with open(file_path, 'w') as file:
+            file.write(f"{size}\n" if base_stations == 1 else f"{size}, {base_stations}\n")
+            _write_text_rows(file, sink_x, sink_y, range_radius)
+            for x, y in chunks:
+                _write_text_rows(file, x, y, range_radius)
+    return size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera redes sintéticas no formato dos arquivos de data/.")
+    parser.add_argument('output')
+    parser.add_argument('--size', type=int, required=True, help="quantidade de motes")
+    parser.add_argument('--deployment', choices=sorted(DEPLOYMENTS), default='uniform')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--connected', action='store_true', help="acrescenta os relays mínimos para que todo mote alcance uma estação base")
+    parser.add_argument('--base-stations', type=int, default=1)
+    parser.add_argument('--range', type=float, default=DEFAULT_RANGE, dest='range_radius')
+    parser.add_argument('--side', type=float, default=None, help="lado da área em metros (padrão: densidade dos arquivos de data/)")
+    parser.add_argument('--binary', action='store_true')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    motes = generate_dataset(args.output, args.size, args.deployment, args.seed, args.connected, args.base_stations, args.range_radius, args.binary, args.side, args.chunk_size)
+    print(f"{motes} motes gravados em {args.output} ({motes - args.size} relays).")
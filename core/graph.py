@@ -1,17 +1,89 @@
-from random import randint
+from array import array
+from copy import deepcopy
+from itertools import chain
+from random import Random, randint
 from random import uniform
 
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Mapping, Optional
 import math
 import heapq
+import time
+
+from core.connectivity import ConnectivityIndex
+from core.dataset_format import is_binary_dataset, read_binary_dataset
+from core.network_cache import cache_path_for, read_cache, write_cache
+from core.routing_cache import RoutingCache
+from core.sensor_store import SensorIds, SensorMapping, SensorStore, as_sensor_ids
+from core.sparse import CSRGraph
+from core.spatial_index import SpatialGrid
+from core.strategies import get_strategy
+from core.telemetry import TelemetryRecorder
+
+def parse_sensor_block(lines: List[str], default_battery: float, default_range: float = 100.0) -> Optional[List[array]]:
+    # Todas as linhas do bloco são convertidas de uma vez; toda linha precisa ter as colunas da primeira
+    if not lines:
+        return [array('d') for _ in range(4)]
+
+    fields = [line.replace(',', ' ').split() for line in lines]
+    columns = len(fields[0])
+    if not 2 <= columns <= 4 or any(len(line_fields) != columns for line_fields in fields):
+        return None
+    try:
+        values = array('d', map(float, chain.from_iterable(fields)))
+    except ValueError:
+        return None
+
+    rows = len(lines)
+    x, y = values[0::columns], values[1::columns]
+    range_radius = values[2::columns] if columns >= 3 else array('d', [default_range]) * rows
+    battery = values[3::columns] if columns >= 4 else array('d', [default_battery]) * rows
+    return [x, y, range_radius, battery]
+
 
 class Sensor:
+    # Visão leve de uma linha do SensorStore; um Sensor avulso guarda os dados num armazenamento próprio
+    __slots__ = ('identifier', '_store', '_index')
+
     def __init__(self, identifier: int, position: Tuple[float, float], range_radius: float, battery_capacity: float, is_base_station: bool = False):
         self.identifier = identifier
-        self.position = position
-        self.range_radius = range_radius
-        self.battery = battery_capacity
-        self.is_base_station = is_base_station
+        self._store = SensorStore()
+        self._index = self._store.append(position[0], position[1], range_radius, battery_capacity, is_base_station)
+
+    @classmethod
+    def view(cls, store: SensorStore, index: int) -> 'Sensor':
+        sensor = cls.__new__(cls)
+        sensor.identifier = index
+        sensor._store = store
+        sensor._index = index
+        return sensor
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        return (self._store.x[self._index], self._store.y[self._index])
+
+    @position.setter
+    def position(self, position: Tuple[float, float]) -> None:
+        self._store.x[self._index], self._store.y[self._index] = position
+
+    @property
+    def range_radius(self) -> float:
+        return self._store.range_radius[self._index]
+
+    @range_radius.setter
+    def range_radius(self, range_radius: float) -> None:
+        self._store.range_radius[self._index] = range_radius
+
+    @property
+    def battery(self) -> float:
+        return self._store.battery[self._index]
+
+    @battery.setter
+    def battery(self, battery: float) -> None:
+        self._store.battery[self._index] = battery
+
+    @property
+    def is_base_station(self) -> bool:
+        return bool(self._store.is_base_station[self._index])
     
     def distance_to(self, other_sensor: 'Sensor') -> float:
         x1, y1 = self.position
@@ -42,82 +114,166 @@ class Sensor:
 
 class SensorNetwork:
     def __init__(self):
-        self.sensors: Dict[int, Sensor] = {}
-        self.transmission_matrix: List[List[float]] = []
-        self.reception_matrix: List[List[float]] = []
+        self.store = SensorStore()
+        self.sensors: Mapping[int, Sensor] = SensorMapping(self.store, Sensor.view)
+        self.links: CSRGraph = CSRGraph(0)
+        self.reverse_links: CSRGraph = CSRGraph(0)
+        self.active = bytearray()
         self.qtd_sensors = 0
 
+        # Incrementado só quando nós ou enlaces mudam de fato; invalida o cache de rotas
+        self.topology_version = 0
+        self.routing_cache = RoutingCache()
+        self.connectivity = ConnectivityIndex(self)
+
+        # Rodada atual e estado das estratégias de roteamento que variam a cada rodada (ex.: LEACH)
+        self.current_round = 0
+        self.strategy_state: Dict[str, dict] = {}
+        # Origem da aleatoriedade das estratégias (ex.: eleição de líderes do LEACH); troque-a para variar a semente
+        self.rng = Random(0)
+
+        # Mensagens por rodada desligadas por padrão; use core.telemetry para registrar as épocas
+        self.verbose = False
+
+    @property
+    def base_station_ids(self) -> List[int]:
+        return [sensor_id for sensor_id, is_base in enumerate(self.store.is_base_station) if is_base]
+
+    @property
+    def mote_ids(self) -> List[int]:
+        return [sensor_id for sensor_id, is_base in enumerate(self.store.is_base_station) if not is_base]
+
     def add_sensor(self, sensor: Sensor):
         id = sensor.identifier
-        self.sensors[id] = sensor
+        x, y = sensor.position
+        self.store.assign(id, x, y, sensor.range_radius, sensor.battery, sensor.is_base_station)
+
+        # O objeto passa a ser uma visão do armazenamento da rede
+        sensor._store = self.store
+        sensor._index = id
+
+    def copy(self) -> 'SensorNetwork':
+        # Topologia e rotas já calculadas compartilhadas com o original; baterias, nós ativos e
+        # estado das estratégias são independentes
+        network = SensorNetwork()
+        network.store = self.store.copy()
+        network.sensors = SensorMapping(network.store, Sensor.view)
+        network.links = self.links
+        network.reverse_links = self.reverse_links
+        network.active = bytearray(self.active)
+        network.qtd_sensors = self.qtd_sensors
+        network.topology_version = self.topology_version
+        network.routing_cache = self.routing_cache.copy()
+        network.connectivity = self.connectivity.copy(network)
+        network.current_round = self.current_round
+        network.strategy_state = deepcopy(self.strategy_state)
+        network.rng = deepcopy(self.rng)
+        network.verbose = self.verbose
+        return network
+
+    def load_from_file(self, file_path: str, use_cache: bool = True) -> bool:
+        # A rede já processada (coordenadas e enlaces) fica num cache binário indexado pelo hash do arquivo
+        energy_params = (50e-9, 100e-12, 4000)
+        cache_path = cache_path_for(file_path) if use_cache else None
+        if cache_path is not None and read_cache(self, cache_path, energy_params):
+            self.topology_version += 1
+            return True
 
-    def load_from_file(self, file_path: str) -> bool:
-        with open(file_path, 'r') as file:
-            lines = file.readlines()
-        
-        for i, line in enumerate(lines):
-            if i == 0:
-                self.qtd_sensors = int(line.strip())
-            elif i == 1:
-                base_station_coords = tuple(map(float, line.strip().split(',')))
-                sensor = Sensor(identifier=0, position=base_station_coords, range_radius=100.0, battery_capacity=float('inf'), is_base_station=True)
-                self.add_sensor(sensor)
-            else:
-                battery = 1.0
-                x, y = map(float, line.strip().split(','))
-                sensor = Sensor(identifier=i-1, position=(x, y), range_radius=100.0, battery_capacity=battery)
-                self.add_sensor(sensor)
-        
-        if self.qtd_sensors != len(self.sensors) - 1:
+        # Arquivos gerados por core.generator podem vir no formato binário (core.dataset_format)
+        dataset = read_binary_dataset(file_path) if is_binary_dataset(file_path) else self.parse_text_dataset(file_path)
+        if dataset is None:
             print("Erro ao carregar os sensores.")
-            self.sensors = {}
+            self.store.clear()
             self.qtd_sensors = 0
             return False
 
+        qtd_motes, qtd_base_stations, columns = dataset
+        # Estações base têm energia ilimitada: uma coluna de bateria nas suas linhas é ignorada
+        columns[3][:qtd_base_stations] = array('d', [float('inf')]) * qtd_base_stations
+        is_base_station = bytearray([1]) * qtd_base_stations + bytearray(qtd_motes)
+        self.store.load_columns(*columns, is_base_station)
+
         self.qtd_sensors = len(self.sensors)
-        self.build_adjacency_matrix()
+        self.build_adjacency_matrix(*energy_params)
+
+        if cache_path is not None:
+            try:
+                write_cache(self, cache_path, energy_params)
+            except OSError:
+                print("Não foi possível gravar o cache da rede.")
         return True
 
+    def parse_text_dataset(self, file_path: str) -> Optional[Tuple[int, int, List[array]]]:
+        with open(file_path, 'r') as file:
+            header, _, body = file.read().partition('\n')
+
+        # 1ª linha: "motes" ou "motes, estações base"; depois as estações base e os motes, um por linha,
+        # como "x, y" com alcance e bateria opcionais ("x, y, alcance" ou "x, y, alcance, bateria")
+        try:
+            header_values = [int(value) for value in header.replace(',', ' ').split()]
+        except ValueError:
+            return None
+        if not 1 <= len(header_values) <= 2 or min(header_values) < 0:
+            return None
+
+        qtd_motes = header_values[0]
+        qtd_base_stations = header_values[1] if len(header_values) > 1 else 1
+        lines = [line for line in body.splitlines() if line.strip()]
+
+        base_stations = parse_sensor_block(lines[:qtd_base_stations], float('inf'))
+        motes = parse_sensor_block(lines[qtd_base_stations:], 1.0)
+
+        if base_stations is None or motes is None or len(base_stations[0]) != qtd_base_stations or len(motes[0]) != qtd_motes:
+            return None
+        return qtd_motes, qtd_base_stations, [base_column + mote_column for base_column, mote_column in zip(base_stations, motes)]
+
+    def iter_link_rows(self, Eelec: float = 50e-9, Eamp: float = 100e-12, k: int = 4000):
+        if not self.sensors:
+            return
+
+        store = self.store
+        grid = SpatialGrid(max(store.range_radius))
+        for sensor_id in range(len(store)):
+            grid.insert(sensor_id, (store.x[sensor_id], store.y[sensor_id]))
+
+        # Só os pares dentro do raio de alcance são visitados (grade espacial)
+        for sensor_1_id in range(len(store)):
+            position = (store.x[sensor_1_id], store.y[sensor_1_id])
+            neighbors = sorted(
+                (sensor_2_id, distance)
+                for sensor_2_id, distance in grid.query(position, store.range_radius[sensor_1_id])
+                if sensor_2_id != sensor_1_id
+            )
+
+            # Calcular a energia necessária para a transmissão e para a recepção
+            neighbor_ids = [sensor_2_id for sensor_2_id, _ in neighbors]
+            transmission_energies = [Eelec * k + Eamp * k * distance**2 for _, distance in neighbors]
+            reception_energies = [Eelec * k] * len(neighbors)
+            yield neighbor_ids, transmission_energies, reception_energies
+
     def build_adjacency_matrix(self, Eelec: float = 50e-9, Eamp: float = 100e-12, k: int = 4000) -> None:
         size = len(self.sensors)
+        self.links = CSRGraph.from_rows(size, self.iter_link_rows(Eelec, Eamp, k))
+        self.reverse_links = self.links.reversed()
+        self.active = bytearray([1]) * size
+        self.topology_version += 1
 
-        self.transmission_matrix = [[float('inf')] * size for _ in range(size)]
-        self.reception_matrix = [[float('inf')] * size for _ in range(size)]
-
-        for sensor_1_id in self.sensors:
-            sensor1 = self.sensors[sensor_1_id]
-
-            for sensor_2_id in self.sensors:
-                sensor2 = self.sensors[sensor_2_id]
-
-                if sensor_1_id != sensor_2_id:
-                    distance = sensor1.distance_to(sensor2)
-                    if sensor1.can_communicate_with(sensor2):
-                        # Calcular a energia necessária para a transmissão
-                        transmission_energy = Eelec * k + Eamp * k * distance**2
-                        self.transmission_matrix[sensor_1_id][sensor_2_id] = transmission_energy
-                        
-                        # Calcular a energia necessária para a recepção
-                        reception_energy = Eelec * k
-                        self.reception_matrix[sensor_1_id][sensor_2_id] = reception_energy
-                    else:
-                        self.transmission_matrix[sensor_1_id][sensor_2_id] = float('inf')
-                        self.reception_matrix[sensor_1_id][sensor_2_id] = float('inf')
-                else:
-                    self.transmission_matrix[sensor_1_id][sensor_2_id] = 0.0
-                    self.reception_matrix[sensor_1_id][sensor_2_id] = 0.0
+    def dense_matrices(self) -> Tuple[List[List[float]], List[List[float]]]:
+        return self.links.to_dense(self.active)
 
     def print_adjacency_matrices(self) -> None:
+        transmission_matrix, reception_matrix = self.dense_matrices()
+
         print("Matriz de gasto energético para transmissão:")
         for i in range(self.qtd_sensors):
             for j in range(self.qtd_sensors):
-                print(f"{self.transmission_matrix[i][j]: .2e}", end="\t")
+                print(f"{transmission_matrix[i][j]: .2e}", end="\t")
             print()
 
         print("\nMatriz de gasto energético para recepção:")
         for i in range(self.qtd_sensors):
             for j in range(self.qtd_sensors):
-                print(f"{self.reception_matrix[i][j]: .2e}", end="\t")
+                print(f"{reception_matrix[i][j]: .2e}", end="\t")
             print()
     
         
@@ -125,8 +281,12 @@ class SensorNetwork:
         if receiver_id not in self.sensors or sender_id not in self.sensors:
             return None
         
-        transmission_energy = self.transmission_matrix[sender_id][receiver_id]
-        reception_energy = self.reception_matrix[sender_id][receiver_id]
+        edge = self.links.edge_index(sender_id, receiver_id)
+        if edge is None or not self.active[sender_id] or not self.active[receiver_id]:
+            return None
+
+        transmission_energy = self.links.tx_energy[edge]
+        reception_energy = self.links.rx_energy[edge]
 
 
         sender = self.sensors[sender_id]
@@ -140,13 +300,25 @@ class SensorNetwork:
             else:
                 # print(f"Comunicação falhou entre o sensor {sender_id} e o sensor {receiver_id} por falta de bateria.")
                 return None
+
+        # Quem não tem carga para a sua parte do salto gasta o que resta e esgota, como na contabilização em lote
+        for sensor, energy in ((sender, transmission_energy), (receiver, reception_energy)):
+            if sensor.battery <= energy:
+                sensor.battery = 0.0
+        return None
     
-    def dijkstra(self, start_id: int) -> Tuple[Dict[int, float], Dict[int, int]]:
+    def dijkstra(self, start_id: SensorIds, reverse: bool = False) -> Tuple[Dict[int, float], Dict[int, int]]:
         distances = {sensor_id: float('inf') for sensor_id in self.sensors}
         previous_nodes = {sensor_id: None for sensor_id in self.sensors}
-        distances[start_id] = 0
+        start_ids = as_sensor_ids(start_id)
+        for sensor_id in start_ids:
+            distances[sensor_id] = 0
 
-        priority_queue = [(0, start_id)]
+        # No grafo reverso a árvore fica enraizada no destino: previous_nodes aponta o próximo salto até ele
+        links, active = (self.reverse_links if reverse else self.links), self.active
+        indices, tx_energy = links.indices, links.tx_energy
+        priority_queue = [(0, sensor_id) for sensor_id in start_ids]
+        heapq.heapify(priority_queue)
 
         while priority_queue:
             current_distance, current_id = heapq.heappop(priority_queue)
@@ -154,30 +326,37 @@ class SensorNetwork:
             if current_distance > distances[current_id]:
                 continue
 
-            current_sensor = self.sensors[current_id]
+            if not active[current_id]:
+                continue
 
-            for neighbor_id, energy_cost in enumerate(self.transmission_matrix[current_id]):
-                neighbor_sensor = self.sensors[neighbor_id]
-                receive_cost = self.reception_matrix[current_id][neighbor_id]
+            for edge in links.neighbors(current_id):
+                neighbor_id = indices[edge]
+                if not active[neighbor_id]:
+                    continue
 
-                if energy_cost < float('inf'):
-                    distance = current_distance + energy_cost
+                distance = current_distance + tx_energy[edge]
 
-                    if distance < distances[neighbor_id]:
-                        distances[neighbor_id] = distance
-                        previous_nodes[neighbor_id] = current_id
-                        heapq.heappush(priority_queue, (distance, neighbor_id))
+                if distance < distances[neighbor_id]:
+                    distances[neighbor_id] = distance
+                    previous_nodes[neighbor_id] = current_id
+                    heapq.heappush(priority_queue, (distance, neighbor_id))
 
         return distances, previous_nodes
     
-    def minimum_spanning_tree_prim(self, start_id: int = 0) -> Tuple[Dict[int, Optional[int]], float]:
+    def minimum_spanning_tree_prim(self, start_id: SensorIds = 0, reverse: bool = False) -> Tuple[Dict[int, Optional[int]], float]:
         visited = [False] * self.qtd_sensors
         predecessors = {sensor_id: None for sensor_id in self.sensors}
         min_edge_cost = [float('inf')] * self.qtd_sensors
-        min_edge_cost[start_id] = 0
+        start_ids = as_sensor_ids(start_id)
+        for sensor_id in start_ids:
+            min_edge_cost[sensor_id] = 0
         total_cost = 0
 
-        priority_queue = [(0, start_id)]
+        # No grafo reverso a árvore fica enraizada no destino: previous_nodes aponta o próximo salto até ele
+        links, active = (self.reverse_links if reverse else self.links), self.active
+        indices, tx_energy = links.indices, links.tx_energy
+        priority_queue = [(0, sensor_id) for sensor_id in start_ids]
+        heapq.heapify(priority_queue)
 
         while priority_queue:
             current_cost, current_id = heapq.heappop(priority_queue)
@@ -188,27 +367,44 @@ class SensorNetwork:
             visited[current_id] = True
             total_cost += current_cost
 
-            for neighbor_id, weight in enumerate(self.transmission_matrix[current_id]):
-                if not visited[neighbor_id] and weight < min_edge_cost[neighbor_id]:
+            if not active[current_id]:
+                continue
+
+            for edge in links.neighbors(current_id):
+                neighbor_id = indices[edge]
+                weight = tx_energy[edge]
+                if active[neighbor_id] and not visited[neighbor_id] and weight < min_edge_cost[neighbor_id]:
                     min_edge_cost[neighbor_id] = weight
                     predecessors[neighbor_id] = current_id
                     heapq.heappush(priority_queue, (weight, neighbor_id))
 
         return total_cost, predecessors
 
+    def predecessors(self, start_id: SensorIds, type_algorithm: str = 'dijkstra', reverse: bool = False) -> array:
+        # Resultado guardado até a próxima mudança de topologia; -1 marca nós sem predecessor
+        strategy = get_strategy(type_algorithm)
+        start_id = start_id if isinstance(start_id, int) else as_sensor_ids(start_id)
+        key = (type_algorithm, start_id, reverse)
+        if not strategy.battery_aware:
+            cached = self.routing_cache.get(self.topology_version, key)
+            if cached is not None:
+                return cached
+
+        previous_nodes = strategy.search(self, start_id, reverse)
+        packed = array('i', [-1 if previous_nodes[sensor_id] is None else previous_nodes[sensor_id] for sensor_id in range(len(self.sensors))])
+        if not strategy.battery_aware:
+            self.routing_cache.put(self.topology_version, key, packed)
+        return packed
 
     def get_shortest_path(self, start_id: int, end_id: int, type_algorithm: str = 'dijkstra') -> List[int]:
-        if type_algorithm == 'dijkstra':
-            distances, previous_nodes = self.dijkstra(start_id)
-        
-        if type_algorithm == 'minimum_spanning_tree_prim':
-            distances, previous_nodes = self.minimum_spanning_tree_prim(start_id)
+        previous_nodes = self.predecessors(start_id, type_algorithm)
         path = []
         current_id = end_id
 
-        while current_id is not None:
-            path.insert(0, current_id)
+        while current_id != -1:
+            path.append(current_id)
             current_id = previous_nodes[current_id]
+        path.reverse()
 
         # if distances[end_id] < float('inf'):
         #     return path
@@ -216,12 +412,70 @@ class SensorNetwork:
         #     return []
 
         if len(path) == 1:
-            print(f"Sensor {start_id} e Sensor {end_id} não estão conectados.")
+            if self.verbose:
+                print(f"Sensor {start_id} e Sensor {end_id} não estão conectados.")
             return []
         else:
             # print(f"Menor caminho entre Sensor {start_id} e Sensor {end_id}: {path}. Distância: {distances[end_id]}")
             return path
     
+    def route_to_sink(self, sensor_id: int, type_algorithm: str = 'dijkstra') -> List[int]:
+        # Sensores fora do componente das estações base são descartados sem nenhuma busca
+        if not self.connectivity.is_reachable(sensor_id):
+            if self.verbose:
+                print(f"Sensor {sensor_id} não está conectado a nenhuma estação base.")
+            return []
+
+        base_station_ids = self.base_station_ids
+        if len(base_station_ids) == 1:
+            return self.get_shortest_path(sensor_id, base_station_ids[0], type_algorithm)
+
+        # Com várias estações base, a árvore reversa de múltiplas origens leva cada sensor à mais barata
+        next_hops = self.predecessors(base_station_ids, type_algorithm, reverse=True)
+        path = []
+        current_id = sensor_id
+        while current_id != -1:
+            path.append(current_id)
+            current_id = next_hops[current_id]
+
+        if len(path) == 1:
+            if self.verbose:
+                print(f"Sensor {sensor_id} não está conectado a nenhuma estação base.")
+            return []
+        return path
+
+    def shortest_path_tree(self, root_id: Optional[SensorIds] = None, type_algorithm: str = 'dijkstra') -> List[Optional[int]]:
+        # Sem raiz explícita, a árvore parte de todas as estações base de uma vez
+        if root_id is None:
+            root_id = self.base_station_ids
+        next_hops = self.predecessors(root_id, type_algorithm, reverse=True)
+        return [None if next_hop == -1 else next_hop for next_hop in next_hops]
+
+    def routes_from_tree(self, parents: List[Optional[int]], root_id: Optional[SensorIds] = None) -> Dict[int, List[int]]:
+        # Cada rota é a do próximo salto com o próprio nó na frente, então cada nó é resolvido uma única vez
+        root_ids = as_sensor_ids(self.base_station_ids if root_id is None else root_id)
+        routes: Dict[int, List[int]] = {sensor_id: [sensor_id] for sensor_id in root_ids}
+
+        for sensor_id in range(len(parents)):
+            chain = []
+            current_id = sensor_id
+            while current_id is not None and current_id not in routes:
+                chain.append(current_id)
+                current_id = parents[current_id]
+
+            tail = routes[current_id] if current_id is not None else []
+            for node_id in reversed(chain):
+                tail = [node_id] + tail if tail else []
+                routes[node_id] = tail
+
+        for sensor_id in root_ids:
+            del routes[sensor_id]
+        if self.verbose:
+            for sensor_id, route in routes.items():
+                if not route:
+                    print(f"Sensor {sensor_id} não está conectado a nenhuma estação base.")
+        return routes
+
     def simulate_data_transmission(self, start_id: int, end_id: int, path: str) -> Optional[float]:
         total_energy = 0.0
 
@@ -233,79 +487,106 @@ class SensorNetwork:
             # Simula a comunicação e calcula o consumo de energia
             result = self.simulate_communication(sender, receiver, 4000)  # Supondo que 4000 seja o tamanho dos dados
             if result is None:
-                print(f"Comunicação entre sensor {sender} e sensor {receiver} falhou.")
+                if self.verbose:
+                    print(f"Comunicação entre sensor {sender} e sensor {receiver} falhou.")
                 return None
             
-            # Atualiza o total de energia consumida
+            # Atualiza o total de energia consumida (simulate_communication já debitou emissor e receptor)
             total_energy += result
 
-            # Atualiza a energia do sensor de envio
-            self.sensors[sender].battery -= result  # Subtrai o consumo de energia do sensor sender
-
-            # Verifica se o sensor ficou sem energia
-            if self.sensors[sender].battery <= 0:
-                return None  
-
         # Se todos os sensores estiverem bem, retorna o total de energia consumida
         # print(f"Os dados foram transmitidos com sucesso de {start_id} para {end_id}. Gastou-se {total_energy} de energia.")
         return total_energy
 
     
-    def select_random_sensor(self) -> int:
-        sensor_ids = list(self.sensors.keys())
-        sensor_ids.remove(0)
-        return sensor_ids[randint(0, len(sensor_ids) - 1)]
+    def select_random_sensor(self, rng: Optional[Random] = None) -> int:
+        mote_ids = self.mote_ids
+        if rng is None:
+            return mote_ids[randint(0, len(mote_ids) - 1)]
+        return mote_ids[rng.randint(0, len(mote_ids) - 1)]
+
+    def run_simulation_agm(self, max_rounds: int = 400, algorithm: str = 'minimum_spanning_tree_prim', rng: Optional[Random] = None, telemetry: Optional[TelemetryRecorder] = None) -> Dict[str, float]:
+        summary = {'rounds': 0, 'delivered': 0, 'failed': 0, 'energy': 0.0, 'sink_isolated': None}
+        if rng is not None:
+            # Estratégias aleatórias seguem a mesma semente da escolha dos sensores
+            self.rng = rng
+        if telemetry is not None:
+            telemetry.start(self.store.battery)
 
-    def run_simulation_agm(self, max_rounds: int = 400, algorithm: str = 'minimum_spanning_tree_prim'):
         for round_num in range(max_rounds):
-            print(f"\n--- Round {round_num + 1} ---")
+            if self.connectivity.sink_isolated():
+                # Nenhum mote vivo alcança uma estação base: todas as rodadas seguintes falhariam
+                if self.verbose:
+                    print("Estações base isoladas. Encerrando a simulação.")
+                summary['sink_isolated'] = round_num
+                break
 
-            start_sensor = self.select_random_sensor()
-            end_sensor = 0
+            if self.verbose:
+                print(f"\n--- Round {round_num + 1} ---")
+            summary['rounds'] += 1
+            self.current_round += 1
 
-            path = self.get_shortest_path(start_sensor, end_sensor, algorithm)
-            if not path:
-                print("No path found. Rebuilding the network...")
-                _, _ = self.minimum_spanning_tree_prim()
-                continue
+            start_sensor = self.select_random_sensor(rng)
 
-            total_energy = self.simulate_data_transmission(start_sensor, end_sensor, algorithm)
+            start = time.perf_counter()
+            path = self.route_to_sink(start_sensor, algorithm)
+            routing_time = time.perf_counter() - start
 
-            if total_energy is None:
-                print("Energy depleted on one or more sensors. Rebuilding the network...")
-                self.remove_depleted_sensors()
-                _, _ = self.minimum_spanning_tree_prim()
+            start = time.perf_counter()
+            if not path:
+                if self.verbose:
+                    print("No path found.")
+                summary['failed'] += 1
             else:
-                print(f"Round {round_num + 1} completed successfully.")
-                print(f"total energy: {total_energy}")
-                print(f"path: {path}")
+                end_sensor = path[-1]
+                total_energy = self.simulate_data_transmission(start_sensor, end_sensor, path)
+
+                if total_energy is None:
+                    if self.verbose:
+                        print("Energy depleted on one or more sensors. Removing depleted sensors...")
+                    self.remove_depleted_sensors()
+                    summary['failed'] += 1
+                else:
+                    if self.verbose:
+                        print(f"Round {round_num + 1} completed successfully.")
+                        print(f"total energy: {total_energy}")
+                        print(f"path: {path}")
+                    summary['delivered'] += 1
+                    summary['energy'] += total_energy
+            accounting_time = time.perf_counter() - start
+
+            if telemetry is not None:
+                telemetry.record_epoch(self.current_round, self.store.battery, {start_sensor: path} if path else {}, routing_time, accounting_time)
+
+        return summary
         
     def run_simulation_djikstra(self, algorithm: str = 'dijkstra'):
-        for i in range(1, self.qtd_sensors):
-            start = i
-            end = 0
-
-            print(self.get_shortest_path(start, end, algorithm))
-            total_energy = self.simulate_data_transmission(start, end, algorithm)
+        for start in self.mote_ids:
+            path = self.route_to_sink(start, algorithm)
+            if self.verbose:
+                print(path)
+            total_energy = self.simulate_data_transmission(start, path[-1] if path else None, path)
 
-            print(f"Sensor {start} battery: {self.sensors[start].battery}")
-            print(f"Toal energy consumed: {total_energy}")
+            if self.verbose:
+                print(f"Sensor {start} battery: {self.sensors[start].battery}")
+                print(f"Toal energy consumed: {total_energy}")
 
     def remove_depleted_sensors(self):
         sensors_to_remove = []
 
-        for sensor_id, sensor in self.sensors.items():
-            if sensor.battery <= 0:
-                print(f"Removendo {sensor_id} devido a bateria esgotada.")
+        for sensor_id, battery in enumerate(self.store.battery):
+            if battery <= 0 and self.active[sensor_id]:
+                if self.verbose:
+                    print(f"Removendo {sensor_id} devido a bateria esgotada.")
                 sensors_to_remove.append(sensor_id)
         
+        # Desativar o nó remove todas as arestas que entram e saem dele
         for sensor_id in sensors_to_remove:
-            for neighbor_id in range(self.qtd_sensors):
-                self.transmission_matrix[sensor_id][neighbor_id] = float('inf')
-                self.transmission_matrix[neighbor_id][sensor_id] = float('inf')
+            self.active[sensor_id] = 0
+        if sensors_to_remove:
+            self.topology_version += 1
 
-                self.reception_matrix[sensor_id][neighbor_id] = float('inf')
-                self.reception_matrix[neighbor_id][sensor_id] = float('inf')
+        return sensors_to_remove
 
 
 
@@ -313,6 +594,7 @@ class SensorNetwork:
 if __name__ == "__main__":
     file_path = "data/Cenário 4 - Rede 400.txt"
     graph = SensorNetwork()
+    graph.verbose = True
     graph.load_from_file(file_path)
     graph.print_adjacency_matrices()
 
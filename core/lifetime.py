@@ -0,0 +1,85 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+
+from core.energy import BatchEnergyModel
+from core.graph import SensorNetwork
+from core.routing import IncrementalRoutingTree
+
+
+class LifetimeSimulator:
+    def __init__(self, network: SensorNetwork, algorithm: str = 'dijkstra', root_ids: Optional[Sequence[int]] = None, routing_tree: Optional[IncrementalRoutingTree] = None, compression_ratio: float = 1.0):
+        self.network = network
+        self.root_ids = list(network.base_station_ids if root_ids is None else root_ids)
+        self.routing_tree = routing_tree or IncrementalRoutingTree(network, self.root_ids, algorithm)
+        self.energy_model = BatchEnergyModel(network, self.root_ids, compression_ratio)
+        self.current_round = 0
+        self.deaths: List[Tuple[int, int]] = []
+
+    def rounds_until_depletion(self, battery: float, drain: float) -> int:
+        # Menor r tal que battery - r * drain <= 0, corrigindo o arredondamento da divisão
+        rounds = max(1, math.ceil(battery / drain))
+        while battery - rounds * drain > 0:
+            rounds += 1
+        while rounds > 1 and battery - (rounds - 1) * drain <= 0:
+            rounds -= 1
+        return rounds
+
+    def reachable_sensors(self) -> int:
+        parents, active = self.routing_tree.parents, self.network.active
+        return sum(1 for sensor_id, parent_id in enumerate(parents) if parent_id is not None and active[sensor_id])
+
+    def run(self, max_rounds: int = 1_000_000) -> Dict[str, Optional[int]]:
+        store, active = self.network.store, self.network.active
+        batteries, is_base_station = store.battery, store.is_base_station
+        # Estratégias que dependem da bateria mudam a árvore a cada rodada: não dá para avançar em saltos
+        battery_aware = self.routing_tree.battery_aware
+        steps = 0
+        sink_isolated = None
+
+        # Sensores que esgotaram na última época já simulada saem antes do primeiro salto, para não
+        # retransmitirem (e serem cobrados) por mais uma rodada
+        depleted = self.network.remove_depleted_sensors()
+        if depleted:
+            self.deaths.extend((self.current_round, sensor_id) for sensor_id in depleted)
+            if not battery_aware:
+                self.routing_tree.remove_sensors(depleted)
+
+        while self.current_round < max_rounds:
+            if battery_aware:
+                self.network.current_round = self.current_round + 1
+                self.routing_tree.rebuild()
+
+            if self.reachable_sensors() == 0:
+                sink_isolated = self.current_round
+                break
+
+            # Enquanto a topologia não muda, o gasto por rodada de cada nó é constante
+            drain = self.energy_model.epoch_drain(self.routing_tree.parents)
+            jump = 1 if battery_aware else max_rounds - self.current_round
+            for sensor_id, energy in enumerate(drain):
+                if energy > 0 and active[sensor_id] and not is_base_station[sensor_id]:
+                    jump = min(jump, self.rounds_until_depletion(batteries[sensor_id], energy))
+
+            for sensor_id, energy in enumerate(drain):
+                if energy > 0 and not is_base_station[sensor_id]:
+                    batteries[sensor_id] -= jump * energy
+
+            self.current_round += jump
+            steps += 1
+
+            depleted = self.network.remove_depleted_sensors()
+            if depleted:
+                self.deaths.extend((self.current_round, sensor_id) for sensor_id in depleted)
+                if not battery_aware:
+                    self.routing_tree.remove_sensors(depleted)
+
+        self.network.current_round = self.current_round
+
+        return {
+            'rounds': self.current_round,
+            'steps': steps,
+            'deaths': len(self.deaths),
+            'first_death': self.deaths[0][0] if self.deaths else None,
+            'last_death': self.deaths[-1][0] if self.deaths else None,
+            'sink_isolated': sink_isolated,
+        }
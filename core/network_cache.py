@@ -0,0 +1,121 @@
+from array import array
+from contextlib import suppress
+from typing import BinaryIO, Callable, Tuple
+import hashlib
+import os
+import struct
+import sys
+
+from core.sparse import CSRGraph
+
+CACHE_MAGIC = b'RSSF'
+CACHE_VERSION = 2
+CACHE_DIRECTORY = '.rssf_cache'
+
+# magic, versão, ordem dos bytes, Eelec, Eamp, k, quantidade de sensores, quantidade de arestas
+HEADER = struct.Struct('<4sIBddqqq')
+
+
+def file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path_for(file_path: str) -> str:
+    directory = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIRECTORY)
+    return os.path.join(directory, f"{file_digest(file_path)}.bin")
+
+
+def byteorder_flag() -> int:
+    return 0 if sys.byteorder == 'little' else 1
+
+
+def write_atomically(file_path: str, write: Callable[[BinaryIO], None]) -> None:
+    # Grava num arquivo temporário e renomeia, para nunca deixar o arquivo pela metade; se a gravação
+    # falhar, o temporário é apagado
+    temporary_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, 'wb') as file:
+            write(file)
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(temporary_path)
+        raise
+
+
+def _payload_size(size: int, edge_count: int) -> int:
+    # Quatro colunas de doubles, a máscara de estações base e os dois grafos CSR (direto e reverso)
+    graph_size = 8 * (size + 1) + 4 * edge_count + 2 * 8 * edge_count
+    return 4 * 8 * size + size + 2 * graph_size
+
+
+def _read_array(file: BinaryIO, typecode: str, count: int) -> array:
+    values = array(typecode)
+    if count:
+        values.fromfile(file, count)
+    return values
+
+
+def _read_graph(file: BinaryIO, size: int, edge_count: int) -> CSRGraph:
+    graph = CSRGraph(size)
+    graph.indptr = _read_array(file, 'q', size + 1)
+    graph.indices = _read_array(file, 'i', edge_count)
+    graph.tx_energy = _read_array(file, 'd', edge_count)
+    graph.rx_energy = _read_array(file, 'd', edge_count)
+    return graph
+
+
+def _write_graph(file: BinaryIO, graph: CSRGraph) -> None:
+    for values in (graph.indptr, graph.indices, graph.tx_energy, graph.rx_energy):
+        values.tofile(file)
+
+
+def write_cache(network, cache_path: str, energy_params: Tuple[float, float, int]) -> None:
+    store = network.store
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    def write(file: BinaryIO) -> None:
+        file.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, byteorder_flag(), *energy_params, len(store), network.links.edge_count))
+        for values in (store.x, store.y, store.range_radius, store.battery):
+            values.tofile(file)
+        file.write(bytes(store.is_base_station))
+        _write_graph(file, network.links)
+        _write_graph(file, network.reverse_links)
+
+    write_atomically(cache_path, write)
+
+
+def read_cache(network, cache_path: str, energy_params: Tuple[float, float, int]) -> bool:
+    try:
+        with open(cache_path, 'rb') as file:
+            header = file.read(HEADER.size)
+            if len(header) != HEADER.size:
+                return False
+
+            magic, version, byteorder, Eelec, Eamp, k, size, edge_count = HEADER.unpack(header)
+            if magic != CACHE_MAGIC or version != CACHE_VERSION or byteorder != byteorder_flag():
+                return False
+            if (Eelec, Eamp, k) != tuple(energy_params):
+                return False
+            if size < 0 or edge_count < 0 or os.fstat(file.fileno()).st_size != HEADER.size + _payload_size(size, edge_count):
+                return False
+
+            columns = [_read_array(file, 'd', size) for _ in range(4)]
+            is_base_station = bytearray(file.read(size))
+            if len(is_base_station) != size:
+                return False
+            links = _read_graph(file, size, edge_count)
+            reverse_links = _read_graph(file, size, edge_count)
+    except (OSError, EOFError, ValueError, struct.error):
+        return False
+
+    network.store.load_columns(*columns, is_base_station)
+    network.links = links
+    network.reverse_links = reverse_links
+    network.active = bytearray([1]) * size
+    network.qtd_sensors = size
+    return True
@@ -0,0 +1,160 @@
+from typing import Iterable, List, Optional, Sequence, Set
+import heapq
+
+from core.graph import SensorNetwork
+from core.strategies import get_strategy
+
+# Estratégias cuja árvore pode ser reparada localmente; as demais são recalculadas por inteiro
+REPAIRABLE_ALGORITHMS = ('dijkstra', 'minimum_spanning_tree_prim')
+
+
+class IncrementalRoutingTree:
+    def __init__(self, network: SensorNetwork, root_ids: Optional[Sequence[int]] = None, type_algorithm: str = 'dijkstra'):
+        self.network = network
+        # Todas as estações base são raízes da mesma floresta; cada sensor fica na árvore da mais barata
+        self.root_ids = list(network.base_station_ids if root_ids is None else root_ids)
+        self.type_algorithm = type_algorithm
+        self.strategy = get_strategy(type_algorithm)
+        self.repairable = type_algorithm in REPAIRABLE_ALGORITHMS
+        self.parents: List[Optional[int]] = []
+        self.costs: List[float] = []
+        self.children: List[Set[int]] = []
+        self.rebuild()
+
+    @property
+    def battery_aware(self) -> bool:
+        return self.strategy.battery_aware
+
+    def rebuild(self) -> None:
+        size = len(self.network.sensors)
+        self.parents = [None] * size
+        self.costs = [float('inf')] * size
+        self.children = [set() for _ in range(size)]
+
+        for root_id in self.root_ids:
+            self.costs[root_id] = 0.0
+        if self.repairable:
+            self._grow([(0.0, root_id) for root_id in self.root_ids], set(range(size)))
+            return
+
+        # Sem regra de reparo local: a árvore vem inteira da estratégia registrada
+        self.parents = self.network.shortest_path_tree(self.root_ids, self.type_algorithm)
+        for sensor_id, parent_id in enumerate(self.parents):
+            if parent_id is not None:
+                self.children[parent_id].add(sensor_id)
+
+    def update(self, removed_ids: Iterable[int]) -> None:
+        # Chamado uma vez por rodada: estratégias que dependem da bateria mudam de custo a cada rodada
+        if self.battery_aware:
+            self.rebuild()
+        elif removed_ids:
+            self.remove_sensors(removed_ids)
+
+    @classmethod
+    def from_state(cls, network: SensorNetwork, root_ids: Optional[Sequence[int]], type_algorithm: str, parents: Sequence[Optional[int]], costs: Sequence[float]) -> 'IncrementalRoutingTree':
+        # Restaura uma árvore já calculada sem refazer a busca; os filhos são derivados dos pais
+        tree = cls.__new__(cls)
+        tree.network = network
+        tree.root_ids = list(network.base_station_ids if root_ids is None else root_ids)
+        tree.type_algorithm = type_algorithm
+        tree.strategy = get_strategy(type_algorithm)
+        tree.repairable = type_algorithm in REPAIRABLE_ALGORITHMS
+        tree.parents = list(parents)
+        tree.costs = list(costs)
+        tree.children = [set() for _ in tree.parents]
+        for sensor_id, parent_id in enumerate(tree.parents):
+            if parent_id is not None:
+                tree.children[parent_id].add(sensor_id)
+        return tree
+
+    def copy(self, network: SensorNetwork) -> 'IncrementalRoutingTree':
+        # Mesma árvore sobre outra rede com a mesma topologia (ex.: um fork da simulação)
+        return IncrementalRoutingTree.from_state(network, self.root_ids, self.type_algorithm, self.parents, self.costs)
+
+    def remove_sensors(self, removed_ids: Iterable[int]) -> Set[int]:
+        # Só a subárvore pendurada nos nós removidos perde a rota; o resto da árvore continua ótimo
+        affected = self._subtree_of(removed_ids)
+        if not affected:
+            return affected
+        if not self.repairable:
+            self.rebuild()
+            return affected
+
+        for sensor_id in affected:
+            parent_id = self.parents[sensor_id]
+            if parent_id is not None and parent_id not in affected:
+                self.children[parent_id].discard(sensor_id)
+            self.parents[sensor_id] = None
+            self.costs[sensor_id] = float('inf')
+            self.children[sensor_id] = set()
+
+        # Cada nó afetado recebe como chave inicial a melhor aresta até a parte intacta da árvore
+        links, active = self.network.links, self.network.active
+        indices, tx_energy = links.indices, links.tx_energy
+        use_path_cost = self.type_algorithm == 'dijkstra'
+        priority_queue = []
+
+        for sensor_id in affected:
+            if not active[sensor_id]:
+                continue
+
+            for edge in links.neighbors(sensor_id):
+                next_hop = indices[edge]
+                if next_hop in affected or not active[next_hop] or self.costs[next_hop] == float('inf'):
+                    continue
+
+                cost = tx_energy[edge] + (self.costs[next_hop] if use_path_cost else 0.0)
+                if cost < self.costs[sensor_id]:
+                    self.costs[sensor_id] = cost
+                    self.parents[sensor_id] = next_hop
+
+            if self.parents[sensor_id] is not None:
+                self.children[self.parents[sensor_id]].add(sensor_id)
+                heapq.heappush(priority_queue, (self.costs[sensor_id], sensor_id))
+
+        self._grow(priority_queue, affected)
+        return affected
+
+    def _subtree_of(self, sensor_ids: Iterable[int]) -> Set[int]:
+        subtree = set()
+        stack = [sensor_id for sensor_id in sensor_ids if sensor_id not in self.root_ids]
+        while stack:
+            sensor_id = stack.pop()
+            if sensor_id in subtree:
+                continue
+            subtree.add(sensor_id)
+            stack.extend(self.children[sensor_id])
+        return subtree
+
+    def _grow(self, priority_queue: list, pending: Set[int]) -> None:
+        # Dijkstra (custo acumulado) ou Prim (custo da aresta) restrito aos nós pendentes, no grafo reverso
+        reverse_links, active = self.network.reverse_links, self.network.active
+        indices, tx_energy = reverse_links.indices, reverse_links.tx_energy
+        use_path_cost = self.type_algorithm == 'dijkstra'
+        settled = set()
+
+        while priority_queue:
+            current_cost, current_id = heapq.heappop(priority_queue)
+
+            if current_id in settled or current_cost > self.costs[current_id]:
+                continue
+            settled.add(current_id)
+
+            if not active[current_id]:
+                continue
+
+            for edge in reverse_links.neighbors(current_id):
+                sender_id = indices[edge]
+                if sender_id not in pending or sender_id in settled or not active[sender_id]:
+                    continue
+
+                cost = tx_energy[edge] + (current_cost if use_path_cost else 0.0)
+                if cost < self.costs[sender_id]:
+                    old_parent = self.parents[sender_id]
+                    if old_parent is not None:
+                        self.children[old_parent].discard(sender_id)
+
+                    self.costs[sender_id] = cost
+                    self.parents[sender_id] = current_id
+                    self.children[current_id].add(sender_id)
+                    heapq.heappush(priority_queue, (cost, sender_id))
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+# Cada árvore guardada ocupa 4 bytes por sensor: o limite é em bytes para não crescer com o tamanho da rede
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _value_size(value) -> int:
+    return len(value) * value.itemsize
+
+
+class RoutingCache:
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict = OrderedDict()
+        self.size_bytes = 0
+        self.version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _sync(self, version: int) -> None:
+        # Qualquer mudança de topologia invalida todas as rotas guardadas
+        if version != self.version:
+            self.entries.clear()
+            self.size_bytes = 0
+            self.version = version
+
+    def get(self, version: int, key: Hashable):
+        self._sync(version)
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, version: int, key: Hashable, value) -> None:
+        self._sync(version)
+        size = _value_size(value)
+        if size > self.max_bytes:
+            return
+
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size_bytes -= _value_size(previous)
+        self.entries[key] = value
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size_bytes -= _value_size(evicted)
+
+    def copy(self) -> 'RoutingCache':
+        # As rotas guardadas não são alteradas por quem as lê, então a cópia pode compartilhá-las
+        cache = RoutingCache(self.max_bytes)
+        cache.entries = OrderedDict(self.entries)
+        cache.size_bytes = self.size_bytes
+        cache.version = self.version
+        return cache
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size_bytes = 0
+        self.version = None
@@ -0,0 +1,85 @@
+from array import array
+from collections.abc import Mapping
+from typing import Callable, Iterator, Sequence, Tuple, Union
+
+# Um id ou vários: com várias origens as buscas partem de todas ao mesmo tempo (super-nó virtual)
+SensorIds = Union[int, Sequence[int]]
+
+
+def as_sensor_ids(sensor_ids: SensorIds) -> Tuple[int, ...]:
+    if isinstance(sensor_ids, int):
+        return (sensor_ids,)
+    return tuple(sensor_ids)
+
+
+class SensorStore:
+    def __init__(self):
+        self.x = array('d')
+        self.y = array('d')
+        self.range_radius = array('d')
+        self.battery = array('d')
+        self.is_base_station = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def append(self, x: float, y: float, range_radius: float, battery: float, is_base_station: bool) -> int:
+        self.x.append(x)
+        self.y.append(y)
+        self.range_radius.append(range_radius)
+        self.battery.append(battery)
+        self.is_base_station.append(1 if is_base_station else 0)
+        return len(self.x) - 1
+
+    def assign(self, index: int, x: float, y: float, range_radius: float, battery: float, is_base_station: bool) -> None:
+        if index == len(self):
+            self.append(x, y, range_radius, battery, is_base_station)
+            return
+        if not 0 <= index < len(self):
+            raise IndexError(f"Identificador {index} fora da sequência de sensores (0..{len(self)}).")
+
+        self.x[index] = x
+        self.y[index] = y
+        self.range_radius[index] = range_radius
+        self.battery[index] = battery
+        self.is_base_station[index] = 1 if is_base_station else 0
+
+    def load_columns(self, x: array, y: array, range_radius: array, battery: array, is_base_station: bytearray) -> None:
+        if not len(x) == len(y) == len(range_radius) == len(battery) == len(is_base_station):
+            raise ValueError("Colunas de tamanhos diferentes.")
+        self.x, self.y, self.range_radius, self.battery = x, y, range_radius, battery
+        self.is_base_station = is_base_station
+
+    def clear(self) -> None:
+        self.__init__()
+
+    def copy(self) -> 'SensorStore':
+        # Coordenadas e alcance são compartilhados (somente leitura); só a bateria é copiada
+        store = SensorStore.__new__(SensorStore)
+        store.x = self.x
+        store.y = self.y
+        store.range_radius = self.range_radius
+        store.battery = array('d', self.battery)
+        store.is_base_station = self.is_base_station
+        return store
+
+
+class SensorMapping(Mapping):
+    # Visão Dict[int, Sensor] sobre o armazenamento em colunas: os objetos Sensor são criados sob demanda
+    def __init__(self, store: SensorStore, view_factory: Callable):
+        self.store = store
+        self.view_factory = view_factory
+
+    def __getitem__(self, sensor_id: int):
+        if not isinstance(sensor_id, int) or not 0 <= sensor_id < len(self.store):
+            raise KeyError(sensor_id)
+        return self.view_factory(self.store, sensor_id)
+
+    def __contains__(self, sensor_id) -> bool:
+        return isinstance(sensor_id, int) and 0 <= sensor_id < len(self.store)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.store)))
+
+    def __len__(self) -> int:
+        return len(self.store)
@@ -1,48 +1,187 @@
+from core.checkpoint import read_checkpoint, write_checkpoint
 from core.graph import SensorNetwork, Sensor
-from typing import Dict, List, Tuple
+from core.energy import BatchEnergyModel
+from core.lifetime import LifetimeSimulator
+from core.routing import IncrementalRoutingTree
+from core.telemetry import TelemetryRecorder
+from random import Random
+from typing import Dict, List, Optional, Tuple
+import time
 
 class Simulation:
     def __init__(self):
         self.network: SensorNetwork = None
         self.current_paths: Dict[int, list] = {}
+        self.routing_parents: List[Optional[int]] = []
+        self.routing_tree: Optional[IncrementalRoutingTree] = None
+        self.energy_model: Optional[BatchEnergyModel] = None
+        self.telemetry: Optional[TelemetryRecorder] = None
+        self.dataset_path: Optional[str] = None
+        self.dataset_digest: Optional[str] = None
 
     
-    def create_new_simulation(self, dataset_path: str, epochs: int, algorithm: str) -> bool:
+    def create_new_simulation(self, dataset_path: str, epochs: int, algorithm: str, routing_mode: str = 'per_sensor', accounting: str = 'per_hop', compression_ratio: float = 1.0) -> bool:
         print("Criando nova simulação...")
-        self.epochs = epochs
-        self.current_epoch = 0
-        self.network = SensorNetwork()
-        self.algorithm = algorithm
+        network = SensorNetwork()
         
         try:
-            self.network.load_from_file(dataset_path)
+            network.load_from_file(dataset_path)
         except FileNotFoundError:
             print("Dataset não encontrado.")
             return False
 
+        if not self.use_network(network, epochs, algorithm, routing_mode, accounting, compression_ratio=compression_ratio):
+            return False
+        self.dataset_path = dataset_path
+        self.dataset_digest = None
+
         print("Simulação criada com sucesso.")
         return True
 
+    def use_network(self, network: SensorNetwork, epochs: int, algorithm: str, routing_mode: str = 'per_sensor', accounting: str = 'per_hop', routing_tree: Optional[IncrementalRoutingTree] = None, compression_ratio: float = 1.0) -> bool:
+        self.epochs = epochs
+        self.current_epoch = 0
+        self.network = network
+        self.algorithm = algorithm
+        self.routing_mode = routing_mode
+        self.accounting = accounting
+        self.compression_ratio = compression_ratio
+        self.current_paths = {}
+        self.routing_parents = []
+        self.routing_tree = None
+
+        if accounting == 'batch' and routing_mode == 'per_sensor':
+            print("A contabilização em lote exige uma árvore de roteamento (routing_mode 'tree' ou 'incremental').")
+            self.network = None
+            return False
+
+        if compression_ratio != 1.0 and accounting != 'batch':
+            print("A agregação de dados exige a contabilização em lote (accounting 'batch').")
+            self.network = None
+            return False
+
+        if self.routing_mode == 'incremental':
+            self.routing_tree = routing_tree or IncrementalRoutingTree(self.network, None, self.algorithm)
+        self.energy_model = BatchEnergyModel(self.network, None, compression_ratio)
+        return True
+
     def delete_simulation(self) -> None:
         self.network = None
         print("Simulação deletada.")
         
+    def fork(self) -> 'Simulation':
+        # Cópia barata do estado atual: topologia e rotas compartilhadas, baterias e árvore independentes
+        simulation = Simulation()
+        simulation.epochs = self.epochs
+        simulation.current_epoch = self.current_epoch
+        simulation.algorithm = self.algorithm
+        simulation.routing_mode = self.routing_mode
+        simulation.accounting = self.accounting
+        simulation.compression_ratio = self.compression_ratio
+        simulation.dataset_path = self.dataset_path
+        simulation.dataset_digest = self.dataset_digest
+
+        simulation.network = self.network.copy()
+        simulation.current_paths = dict(self.current_paths)
+        simulation.routing_parents = list(self.routing_parents)
+        if self.routing_tree is not None:
+            simulation.routing_tree = self.routing_tree.copy(simulation.network)
+        simulation.energy_model = BatchEnergyModel(simulation.network, None, self.compression_ratio)
+        return simulation
+
+    def save_checkpoint(self, checkpoint_path: str, rng: Optional[Random] = None) -> None:
+        write_checkpoint(self, checkpoint_path, rng)
+
+    def load_checkpoint(self, checkpoint_path: str, rng: Optional[Random] = None) -> bool:
+        # Com a mesma rede já carregada, a restauração reaproveita a topologia em memória
+        if not read_checkpoint(self, checkpoint_path, rng):
+            print("Não foi possível restaurar o checkpoint.")
+            return False
+        return True
+
+    def sink_isolated(self) -> bool:
+        return self.network.connectivity.sink_isolated()
+
     def run_simulation(self, steps: int) -> List[Dict[int, List[int]]]:
         results = []
         for _ in range(steps):
+            # Sem nenhum mote conectado às estações base, as épocas seguintes não mudariam nada
+            if self.sink_isolated():
+                print("Estações base isoladas. Encerrando a simulação.")
+                break
             result = self.next_step()
             results.append(result)
         return results
 
+    def run_lifetime(self, max_rounds: int = 1_000_000) -> Optional[Dict[str, Optional[int]]]:
+        # Avança direto de uma morte de sensor para a próxima em vez de simular rodada a rodada
+        if self.accounting != 'batch':
+            # O avanço usa o modelo em lote; com outra contabilização as métricas não seriam as da simulação
+            print("O tempo de vida exige a contabilização em lote (accounting 'batch').")
+            return None
+
+        lifetime = LifetimeSimulator(self.network, self.algorithm, None, self.routing_tree, self.compression_ratio)
+        lifetime.current_round = self.current_epoch
+        metrics = lifetime.run(max_rounds)
+
+        self.current_epoch = lifetime.current_round
+        self.routing_tree = lifetime.routing_tree
+        self.routing_parents = lifetime.routing_tree.parents
+        return metrics
+
     def next_step(self) -> Dict[int, List[int]]:
         self.current_epoch += 1
+        self.network.current_round = self.current_epoch
         self.current_paths: Dict[int, list] = {}
 
-        self.network.remove_depleted_sensors()
+        removed_sensors = self.network.remove_depleted_sensors()
+        routing_time = 0.0
+        accounting_time = 0.0
+
+        mote_ids = self.network.mote_ids
+
+        if self.routing_mode in ('tree', 'incremental'):
+            # Uma única árvore enraizada nas estações base atende todos os sensores da época
+            start = time.perf_counter()
+            if self.routing_mode == 'incremental':
+                self.routing_tree.update(removed_sensors)
+                self.routing_parents = self.routing_tree.parents
+            else:
+                self.routing_parents = self.network.shortest_path_tree(None, self.algorithm)
+
+            routes = self.network.routes_from_tree(self.routing_parents)
 
-        for sensor_id in range(1, self.network.qtd_sensors):
-            path = self.network.get_shortest_path(sensor_id, 0, self.algorithm)
-            self.current_paths[sensor_id] = path
-            self.network.simulate_data_transmission(sensor_id, 0, path)
+            for sensor_id in mote_ids:
+                self.current_paths[sensor_id] = routes[sensor_id]
+            routing_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if self.accounting == 'batch':
+                # Todas as baterias são debitadas de uma vez a partir da carga de cada nó na árvore,
+                # já considerando a agregação dos dados nos nós intermediários
+                self.energy_model.apply_epoch(self.routing_parents)
+            else:
+                for sensor_id in mote_ids:
+                    path = self.current_paths[sensor_id]
+                    self.network.simulate_data_transmission(sensor_id, path[-1] if path else None, path)
+            accounting_time = time.perf_counter() - start
+        else:
+            for sensor_id in mote_ids:
+                start = time.perf_counter()
+                path = self.network.route_to_sink(sensor_id, self.algorithm)
+                self.current_paths[sensor_id] = path
+                routed = time.perf_counter()
+                self.network.simulate_data_transmission(sensor_id, path[-1] if path else None, path)
+                routing_time += routed - start
+                accounting_time += time.perf_counter() - routed
+
+        if self.telemetry is not None:
+            self.telemetry.record_epoch(self.current_epoch, self.network.store.battery, self.current_paths, routing_time, accounting_time)
         
         return self.current_paths
+
+    def attach_telemetry(self, telemetry: Optional[TelemetryRecorder]) -> None:
+        # Passa a registrar cada época a partir do estado atual das baterias; None desliga o registro
+        self.telemetry = telemetry
+        if telemetry is not None and self.network is not None:
+            telemetry.start(self.network.store.battery)
@@ -0,0 +1,86 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+class CSRGraph:
+    def __init__(self, size: int):
+        self.size = size
+        self.indptr = array('q', [0])
+        self.indices = array('i')
+        self.tx_energy = array('d')
+        self.rx_energy = array('d')
+
+    @classmethod
+    def from_rows(cls, size: int, rows: Iterable[Tuple[Sequence[int], Sequence[float], Sequence[float]]]) -> 'CSRGraph':
+        # Cada linha traz os vizinhos de um nó (ordenados por id) e as energias das arestas
+        graph = cls(size)
+        for neighbor_ids, tx_energies, rx_energies in rows:
+            graph.indices.extend(neighbor_ids)
+            graph.tx_energy.extend(tx_energies)
+            graph.rx_energy.extend(rx_energies)
+            graph.indptr.append(len(graph.indices))
+
+        if len(graph.indptr) != size + 1:
+            raise ValueError("Quantidade de linhas diferente do tamanho do grafo.")
+        return graph
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def neighbors(self, node_id: int) -> range:
+        return range(self.indptr[node_id], self.indptr[node_id + 1])
+
+    def edge_index(self, sender_id: int, receiver_id: int) -> Optional[int]:
+        start, end = self.indptr[sender_id], self.indptr[sender_id + 1]
+        position = bisect_left(self.indices, receiver_id, start, end)
+        if position < end and self.indices[position] == receiver_id:
+            return position
+        return None
+
+    def reversed(self) -> 'CSRGraph':
+        # Linha v do grafo reverso lista os nós que transmitem para v, com a energia da aresta original
+        counts = [0] * (self.size + 1)
+        for receiver_id in self.indices:
+            counts[receiver_id + 1] += 1
+        for node_id in range(self.size):
+            counts[node_id + 1] += counts[node_id]
+
+        graph = CSRGraph(self.size)
+        graph.indptr = array('q', counts)
+        graph.indices = array('i', bytes(graph.indices.itemsize * self.edge_count))
+        graph.tx_energy = array('d', bytes(graph.tx_energy.itemsize * self.edge_count))
+        graph.rx_energy = array('d', bytes(graph.rx_energy.itemsize * self.edge_count))
+
+        next_slot = counts[:-1]
+        for sender_id in range(self.size):
+            for edge in self.neighbors(sender_id):
+                receiver_id = self.indices[edge]
+                slot = next_slot[receiver_id]
+                graph.indices[slot] = sender_id
+                graph.tx_energy[slot] = self.tx_energy[edge]
+                graph.rx_energy[slot] = self.rx_energy[edge]
+                next_slot[receiver_id] = slot + 1
+
+        return graph
+
+    def to_dense(self, active: Optional[Sequence[int]] = None) -> Tuple[List[List[float]], List[List[float]]]:
+        transmission_matrix = [[float('inf')] * self.size for _ in range(self.size)]
+        reception_matrix = [[float('inf')] * self.size for _ in range(self.size)]
+
+        for sender_id in range(self.size):
+            if active is not None and not active[sender_id]:
+                continue
+
+            transmission_matrix[sender_id][sender_id] = 0.0
+            reception_matrix[sender_id][sender_id] = 0.0
+
+            for edge in self.neighbors(sender_id):
+                receiver_id = self.indices[edge]
+                if active is not None and not active[receiver_id]:
+                    continue
+                transmission_matrix[sender_id][receiver_id] = self.tx_energy[edge]
+                reception_matrix[sender_id][receiver_id] = self.rx_energy[edge]
+
+        return transmission_matrix, reception_matrix
@@ -0,0 +1,37 @@
+from typing import Dict, Iterator, List, Tuple
+import math
+
+
+class SpatialGrid:
+    def __init__(self, cell_size: float):
+        if cell_size <= 0:
+            raise ValueError("cell_size deve ser positivo.")
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.positions: Dict[int, Tuple[float, float]] = {}
+
+    def cell_of(self, position: Tuple[float, float]) -> Tuple[int, int]:
+        x, y = position
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def insert(self, identifier: int, position: Tuple[float, float]) -> None:
+        self.positions[identifier] = position
+        self.cells.setdefault(self.cell_of(position), []).append(identifier)
+
+    def query(self, position: Tuple[float, float], radius: float) -> Iterator[Tuple[int, float]]:
+        # Percorre apenas as células que intersectam o círculo de raio `radius`
+        x, y = position
+        reach = math.ceil(radius / self.cell_size)
+        cx, cy = self.cell_of(position)
+
+        for gx in range(cx - reach, cx + reach + 1):
+            for gy in range(cy - reach, cy + reach + 1):
+                bucket = self.cells.get((gx, gy))
+                if bucket is None:
+                    continue
+
+                for identifier in bucket:
+                    ox, oy = self.positions[identifier]
+                    distance = math.sqrt((ox - x) ** 2 + (oy - y) ** 2)
+                    if distance <= radius:
+                        yield identifier, distance
@@ -0,0 +1,166 @@
+from array import array
+from random import Random
+from typing import Callable, Dict, List, Optional, Sequence
+import heapq
+
+from core.sensor_store import SensorIds, as_sensor_ids
+
+# Cada estratégia recebe (rede, nó inicial, reverse) e devolve o predecessor de cada nó na árvore de busca.
+# Com reverse=True a árvore é enraizada no destino e o predecessor é o próximo salto até ele.
+# O nó inicial pode ser uma sequência de ids (várias estações base): todos partem com custo zero.
+SearchFunction = Callable[..., Sequence[Optional[int]]]
+
+
+class RoutingStrategy:
+    def __init__(self, name: str, search: SearchFunction, battery_aware: bool = False, randomized: bool = False):
+        self.name = name
+        self.search = search
+        # Estratégias que dependem da bateria não podem ser guardadas no cache de rotas
+        self.battery_aware = battery_aware
+        # Estratégias que sorteiam a partir de network.rng mudam de resultado com a semente
+        self.randomized = randomized
+
+
+ROUTING_STRATEGIES: Dict[str, RoutingStrategy] = {}
+
+
+def register_strategy(name: str, battery_aware: bool = False, randomized: bool = False) -> Callable[[SearchFunction], SearchFunction]:
+    def decorator(search: SearchFunction) -> SearchFunction:
+        ROUTING_STRATEGIES[name] = RoutingStrategy(name, search, battery_aware, randomized)
+        return search
+    return decorator
+
+
+def get_strategy(name: str) -> RoutingStrategy:
+    strategy = ROUTING_STRATEGIES.get(name)
+    if strategy is None:
+        raise ValueError(f"Algoritmo desconhecido: {name}")
+    return strategy
+
+
+@register_strategy('dijkstra')
+def dijkstra_search(network, start_id: SensorIds, reverse: bool = False) -> Dict[int, Optional[int]]:
+    _, previous_nodes = network.dijkstra(start_id, reverse)
+    return previous_nodes
+
+
+@register_strategy('minimum_spanning_tree_prim')
+def prim_search(network, start_id: SensorIds, reverse: bool = False) -> Dict[int, Optional[int]]:
+    _, previous_nodes = network.minimum_spanning_tree_prim(start_id, reverse)
+    return previous_nodes
+
+
+def _weighted_search(network, start_id: SensorIds, reverse: bool, edge_cost: Callable[[int, int, float], float]) -> List[Optional[int]]:
+    # Dijkstra sobre o CSR com custo de aresta definido pela estratégia; edge_cost recebe (emissor, receptor, energia)
+    links = network.reverse_links if reverse else network.links
+    indices, tx_energy, active = links.indices, links.tx_energy, network.active
+    size = len(network.sensors)
+
+    costs = [float('inf')] * size
+    previous_nodes: List[Optional[int]] = [None] * size
+    priority_queue = []
+    for sensor_id in as_sensor_ids(start_id):
+        costs[sensor_id] = 0.0
+        priority_queue.append((0.0, sensor_id))
+
+    while priority_queue:
+        current_cost, current_id = heapq.heappop(priority_queue)
+        if current_cost > costs[current_id] or not active[current_id]:
+            continue
+
+        for edge in links.neighbors(current_id):
+            neighbor_id = indices[edge]
+            if not active[neighbor_id]:
+                continue
+
+            sender_id, receiver_id = (neighbor_id, current_id) if reverse else (current_id, neighbor_id)
+            cost = current_cost + edge_cost(sender_id, receiver_id, tx_energy[edge])
+            if cost < costs[neighbor_id]:
+                costs[neighbor_id] = cost
+                previous_nodes[neighbor_id] = current_id
+                heapq.heappush(priority_queue, (cost, neighbor_id))
+
+    return previous_nodes
+
+
+@register_strategy('energy_battery_weighted', battery_aware=True)
+def energy_battery_weighted_search(network, start_id: SensorIds, reverse: bool = False) -> List[Optional[int]]:
+    # Energia da transmissão dividida pela bateria restante do emissor: nós fracos ficam caros
+    batteries = network.store.battery
+
+    def edge_cost(sender_id: int, receiver_id: int, energy: float) -> float:
+        return energy / max(batteries[sender_id], 1e-12)
+
+    return _weighted_search(network, start_id, reverse, edge_cost)
+
+
+@register_strategy('max_min_energy', battery_aware=True)
+def max_min_energy_search(network, start_id: SensorIds, reverse: bool = False) -> List[Optional[int]]:
+    # Maximiza a menor bateria entre os emissores do caminho; empates decididos pela energia total
+    links = network.reverse_links if reverse else network.links
+    indices, tx_energy, active = links.indices, links.tx_energy, network.active
+    batteries = network.store.battery
+    size = len(network.sensors)
+
+    labels = [(float('inf'), float('inf'))] * size
+    previous_nodes: List[Optional[int]] = [None] * size
+    priority_queue = []
+    for sensor_id in as_sensor_ids(start_id):
+        labels[sensor_id] = (float('-inf'), 0.0)
+        priority_queue.append((float('-inf'), 0.0, sensor_id))
+    heapq.heapify(priority_queue)
+
+    while priority_queue:
+        negative_bottleneck, energy, current_id = heapq.heappop(priority_queue)
+        if (negative_bottleneck, energy) > labels[current_id] or not active[current_id]:
+            continue
+
+        for edge in links.neighbors(current_id):
+            neighbor_id = indices[edge]
+            if not active[neighbor_id]:
+                continue
+
+            sender_id = neighbor_id if reverse else current_id
+            label = (max(negative_bottleneck, -batteries[sender_id]), energy + tx_energy[edge])
+            if label < labels[neighbor_id]:
+                labels[neighbor_id] = label
+                previous_nodes[neighbor_id] = current_id
+                heapq.heappush(priority_queue, (label[0], label[1], neighbor_id))
+
+    return previous_nodes
+
+
+@register_strategy('leach', battery_aware=True, randomized=True)
+def leach_search(network, start_id: SensorIds, reverse: bool = False, probability: float = 0.1, member_relay_penalty: float = 10.0) -> List[Optional[int]]:
+    # Rotação de líderes no estilo LEACH: a cada rodada um novo conjunto de cluster heads é eleito, e
+    # retransmitir por um nó que não é líder custa member_relay_penalty vezes mais
+    state = network.strategy_state.get('leach')
+    if state is None:
+        state = {'round': None, 'last_head_round': None, 'heads': bytearray(), 'rng': Random(network.rng.getrandbits(64))}
+        network.strategy_state['leach'] = state
+    size = len(network.sensors)
+
+    if state['round'] != network.current_round:
+        state['round'] = network.current_round
+        if state['last_head_round'] is None or len(state['last_head_round']) != size:
+            state['last_head_round'] = array('q', [-(1 << 62)]) * size
+
+        period = max(1, round(1 / probability))
+        threshold = probability / (1 - probability * (network.current_round % period))
+        rng, last_head_round = state['rng'], state['last_head_round']
+        heads = bytearray(size)
+        for sensor_id in range(size):
+            eligible = network.current_round - last_head_round[sensor_id] >= period
+            if network.active[sensor_id] and eligible and rng.random() < threshold:
+                heads[sensor_id] = 1
+                last_head_round[sensor_id] = network.current_round
+        state['heads'] = heads
+
+    heads, is_base_station = state['heads'], network.store.is_base_station
+
+    def edge_cost(sender_id: int, receiver_id: int, energy: float) -> float:
+        if heads[receiver_id] or is_base_station[receiver_id]:
+            return energy
+        return energy * member_relay_penalty
+
+    return _weighted_search(network, start_id, reverse, edge_cost)
@@ -0,0 +1,102 @@
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, List, Optional, TextIO
+import csv
+import json
+
+
+class TelemetrySink(ABC):
+    def __init__(self, file_path: str, buffer_size: int = 1000):
+        self.file_path = file_path
+        self.buffer_size = buffer_size
+        self.buffer: List[Dict[str, object]] = []
+        self.file: Optional[TextIO] = None
+
+    def write(self, record: Dict[str, object]) -> None:
+        # Os registros ficam em memória e são gravados em blocos
+        self.buffer.append(record)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        if self.file is None:
+            self.file = open(self.file_path, 'w', newline='')
+        self.write_records(self.buffer)
+        self.file.flush()
+        self.buffer = []
+
+    @abstractmethod
+    def write_records(self, records: List[Dict[str, object]]) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self) -> 'TelemetrySink':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JsonLinesSink(TelemetrySink):
+    def write_records(self, records: List[Dict[str, object]]) -> None:
+        self.file.write(''.join(json.dumps(record) + '\n' for record in records))
+
+
+class CsvSink(TelemetrySink):
+    # Formato longo: uma linha por sensor e por época, repetindo os campos da época
+    FIELDS = ['epoch', 'routing_time', 'accounting_time', 'sensor_id', 'battery', 'battery_delta', 'hops', 'died']
+
+    def __init__(self, file_path: str, buffer_size: int = 1000):
+        super().__init__(file_path, buffer_size)
+        self.writer = None
+
+    def write_records(self, records: List[Dict[str, object]]) -> None:
+        if self.writer is None:
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(self.FIELDS)
+
+        for record in records:
+            died = set(record['deaths'])
+            epoch_fields = [record['epoch'], record['routing_time'], record['accounting_time']]
+            for sensor_id, (battery, delta, hops) in enumerate(zip(record['batteries'], record['battery_deltas'], record['hops'])):
+                self.writer.writerow(epoch_fields + [sensor_id, battery, delta, hops, int(sensor_id in died)])
+
+
+class TelemetryRecorder:
+    def __init__(self, sink: TelemetrySink, sample_every: int = 1):
+        self.sink = sink
+        self.sample_every = max(1, sample_every)
+        self.previous_batteries: Optional[array] = None
+
+    def start(self, batteries: array) -> None:
+        self.previous_batteries = array('d', batteries)
+
+    def record_epoch(self, epoch: int, batteries: array, current_paths: Dict[int, List[int]], routing_time: float, accounting_time: float) -> None:
+        previous = self.previous_batteries if self.previous_batteries is not None else batteries
+        deaths = [sensor_id for sensor_id, (before, after) in enumerate(zip(previous, batteries)) if before > 0 >= after]
+
+        # Épocas com mortes sempre são registradas, mesmo fora da amostragem
+        if epoch % self.sample_every == 0 or deaths:
+            deltas = [0.0 if before == after else after - before for before, after in zip(previous, batteries)]
+            hops = [len(current_paths[sensor_id]) - 1 if current_paths.get(sensor_id) else -1 for sensor_id in range(len(batteries))]
+            self.sink.write({
+                'epoch': epoch,
+                'routing_time': routing_time,
+                'accounting_time': accounting_time,
+                'deaths': deaths,
+                'batteries': [battery if battery != float('inf') else None for battery in batteries],
+                'battery_deltas': deltas,
+                'hops': hops,
+            })
+
+        self.previous_batteries = array('d', batteries)
+
+    def close(self) -> None:
+        self.sink.close()
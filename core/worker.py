@@ -0,0 +1,117 @@
+from array import array
+from types import MappingProxyType
+from typing import Callable, List, Mapping, NamedTuple, Optional, Sequence
+import queue
+import threading
+import time
+
+from core.graph import SensorNetwork
+from core.simulation import Simulation
+
+
+class SimulationSnapshot(NamedTuple):
+    epoch: int
+    network: Optional[SensorNetwork]
+    batteries: array
+    active: bytes
+    current_paths: Mapping[int, List[int]]
+    # Pai de cada sensor na árvore de roteamento; vazio no modo por sensor
+    routing_parents: Sequence[Optional[int]]
+
+
+class SimulationWorker(threading.Thread):
+    def __init__(self, simulation: Simulation, epochs_per_second: Optional[float] = None, queue_size: int = 2):
+        super().__init__(daemon=True)
+        self.simulation = simulation
+        self.epochs_per_second = epochs_per_second
+        self.snapshots: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.auto_run = threading.Event()
+        self.pending_steps = 0
+        self.wake_up = threading.Event()
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        next_epoch_at = time.perf_counter()
+
+        while not self.stopped.is_set():
+            if not self.auto_run.is_set() and not self.pending_steps:
+                self.wake_up.wait(0.1)
+                self.wake_up.clear()
+                continue
+
+            if self.auto_run.is_set() and self.epochs_per_second:
+                delay = next_epoch_at - time.perf_counter()
+                if delay > 0:
+                    self.wake_up.wait(delay)
+                    self.wake_up.clear()
+                    continue
+                next_epoch_at = max(next_epoch_at, time.perf_counter() - 1.0) + 1.0 / self.epochs_per_second
+
+            with self.lock:
+                self.pending_steps = max(0, self.pending_steps - 1)
+                if self.simulation.network is None:
+                    self.auto_run.clear()
+                    continue
+
+                self.simulation.next_step()
+                if self.simulation.current_epoch >= self.simulation.epochs or self.simulation.sink_isolated():
+                    self.auto_run.clear()
+                self.publish()
+
+    def publish(self) -> None:
+        # Chamado com o lock já adquirido; o renderizador só lê cópias, nunca o estado vivo
+        network = self.simulation.network
+        if network is None:
+            snapshot = SimulationSnapshot(0, None, array('d'), b'', MappingProxyType({}), ())
+        else:
+            snapshot = SimulationSnapshot(
+                self.simulation.current_epoch,
+                network,
+                array('d', network.store.battery),
+                bytes(network.active),
+                MappingProxyType(dict(self.simulation.current_paths)),
+                tuple(self.simulation.routing_parents),
+            )
+
+        # Fila cheia: descarta o snapshot mais antigo para nunca bloquear a simulação
+        while True:
+            try:
+                self.snapshots.put_nowait(snapshot)
+                return
+            except queue.Full:
+                try:
+                    self.snapshots.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def latest_snapshot(self) -> Optional[SimulationSnapshot]:
+        snapshot = None
+        while True:
+            try:
+                snapshot = self.snapshots.get_nowait()
+            except queue.Empty:
+                return snapshot
+
+    def run_locked(self, action: Callable[[], object]) -> object:
+        # Operações do usuário (criar, apagar) acontecem entre duas épocas e geram um snapshot novo
+        with self.lock:
+            result = action()
+            self.publish()
+            return result
+
+    def request_step(self) -> None:
+        with self.lock:
+            self.pending_steps += 1
+        self.wake_up.set()
+
+    def toggle_auto_run(self) -> None:
+        if self.auto_run.is_set():
+            self.auto_run.clear()
+        else:
+            self.auto_run.set()
+        self.wake_up.set()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.wake_up.set()
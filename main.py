@@ -1,11 +1,12 @@
 import pygame
-from typing import Tuple
+from typing import Optional, Tuple
 
 from core.graph import SensorNetwork, Sensor
 from core.simulation import Simulation
+from core.worker import SimulationWorker
 
 class Screen:
-    def __init__(self, width: int, height: int, bg_color: Tuple[int, int, int], simulation: Simulation):
+    def __init__(self, width: int, height: int, bg_color: Tuple[int, int, int], simulation: Simulation, epochs_per_second: Optional[float] = None):
         pygame.init()
         pygame.display.set_caption("Rede de Sensores Sem Fio")
 
@@ -17,6 +18,26 @@ class Screen:
         self.display_radius = False
         self.display_paths = False
 
+        # A simulação roda numa thread própria e publica snapshots; a tela só desenha o mais recente
+        self.worker = SimulationWorker(simulation, epochs_per_second)
+        self.worker.start()
+        self.snapshot = None
+
+        # Camadas pré-renderizadas; refeitas só quando a rede, a tela ou os caminhos mudam
+        self.cached_network = None
+        self.cached_size = None
+        self.cached_paths = None
+        self.cached_snapshot = None
+        self.screen_xs = []
+        self.screen_ys = []
+        self.screen_radii = []
+        self.base_station_ids = []
+        self.sensor_colors = []
+        self.links_layer = None
+        self.radius_layer = None
+        self.paths_layer = None
+        self.sensors_layer = None
+
     def run(self):
         while self.running:
             self.handle_events()
@@ -30,121 +51,155 @@ class Screen:
                 self.running = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_c:
-                    self.simulation.create_new_simulation("data/Cenário 4 - Rede 400.txt", 100, "minimum_spanning_tree_prim")
+                    self.worker.run_locked(lambda: self.simulation.create_new_simulation("data/Cenário 4 - Rede 400.txt", 100, "minimum_spanning_tree_prim", "tree"))
                 if event.key == pygame.K_SPACE:
-                    self.simulation.run_simulation(1)
+                    self.worker.request_step()
+                if event.key == pygame.K_a:
+                    self.worker.toggle_auto_run()
                 if event.key == pygame.K_DELETE:
-                    self.simulation.delete_simulation()
+                    self.worker.run_locked(self.simulation.delete_simulation)
                 if event.key == pygame.K_r:
                     self.display_radius = not self.display_radius
                 if event.key == pygame.K_p:
                     self.display_paths = not self.display_paths
 
     def update(self):
-        # Atualizações futuras (e.g., simulação de sensores) serão feitas aqui.
-        pass
+        snapshot = self.worker.latest_snapshot()
+        if snapshot is not None:
+            self.snapshot = snapshot
 
     def draw(self):
         self.screen.fill(self.bg_color)
-        self.draw_communication_lines()
-        self.draw_paths()
-        self.draw_sensors()
+
+        if self.snapshot is not None and self.snapshot.network is not None:
+            self.refresh_render_cache()
+            self.draw_communication_lines()
+            self.draw_paths()
+            self.draw_sensors()
+
         pygame.display.flip()
-    
-    def draw_sensors(self):
-        if self.simulation.network is None:
+
+    def refresh_render_cache(self):
+        network = self.snapshot.network
+        size = self.screen.get_size()
+
+        # As camadas estáticas só são refeitas quando a rede ou o tamanho da tela mudam
+        if self.cached_network is not network or self.cached_size != size:
+            self.cached_network = network
+            self.cached_size = size
+            self.precompute_screen_coordinates()
+            self.links_layer = self.render_links_layer()
+            self.radius_layer = self.render_radius_layer()
+            self.sensors_layer = pygame.Surface(size, pygame.SRCALPHA)
+            self.sensor_colors = [None] * len(self.screen_xs)
+            self.cached_paths = None
+            self.cached_snapshot = None
+
+        # A camada de caminhos só é montada enquanto estiver visível
+        if self.display_paths and self.cached_paths is not self.snapshot.current_paths:
+            self.cached_paths = self.snapshot.current_paths
+            self.paths_layer = self.render_paths_layer()
+
+        # As cores das baterias só mudam quando chega um snapshot novo
+        if self.cached_snapshot is not self.snapshot:
+            self.cached_snapshot = self.snapshot
+            self.update_sensors_layer()
+
+    def precompute_screen_coordinates(self):
+        store = self.snapshot.network.store
+        width, height = self.screen.get_size()
+        self.screen_xs = [int(round((x / 1000) * width)) for x in store.x]
+        self.screen_ys = [int(round((y / 1000) * height)) for y in store.y]
+        self.screen_radii = [int(round((radius / 1000) * width)) for radius in store.range_radius]
+        self.base_station_ids = [sensor_id for sensor_id, is_base in enumerate(store.is_base_station) if is_base]
+
+    def render_links_layer(self) -> pygame.Surface:
+        layer = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        links = self.snapshot.network.links
+        xs, ys = self.screen_xs, self.screen_ys
+
+        # Cada enlace é desenhado uma vez, mesmo quando existe nos dois sentidos
+        for sensor_1_id in range(links.size):
+            for edge in links.neighbors(sensor_1_id):
+                sensor_2_id = links.indices[edge]
+                if sensor_1_id < sensor_2_id or links.edge_index(sensor_2_id, sensor_1_id) is None:
+                    pygame.draw.line(layer, (0, 0, 0), (xs[sensor_1_id], ys[sensor_1_id]), (xs[sensor_2_id], ys[sensor_2_id]), 1)
+        return layer
+
+    def render_radius_layer(self) -> pygame.Surface:
+        layer = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        is_base_station = self.snapshot.network.store.is_base_station
+
+        for sensor_id in range(len(self.screen_xs)):
+            if not is_base_station[sensor_id]:
+                pygame.draw.circle(layer, (0, 0, 255), (self.screen_xs[sensor_id], self.screen_ys[sensor_id]), self.screen_radii[sensor_id], 1)
+        return layer
+
+    def render_paths_layer(self) -> pygame.Surface:
+        layer = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        xs, ys = self.screen_xs, self.screen_ys
+
+        # Na árvore de roteamento cada sensor tem um único próximo salto: o vetor de pais já traz todos os
+        # saltos, um por sensor. Sem árvore (modo por sensor) os saltos vêm dos caminhos, cada um desenhado uma vez.
+        parents = self.snapshot.routing_parents
+        if parents:
+            hops = [(sensor_id, parent_id) for sensor_id, parent_id in enumerate(parents) if parent_id is not None]
+        else:
+            hops = set()
+            for path in self.snapshot.current_paths.values():
+                hops.update(zip(path, path[1:]))
+
+        for sensor_1_id, sensor_2_id in hops:
+            pygame.draw.line(layer, (0, 0, 0), (xs[sensor_1_id], ys[sensor_1_id]), (xs[sensor_2_id], ys[sensor_2_id]), 1)
+        return layer
+
+    @staticmethod
+    def battery_color(battery_level: float) -> Tuple[int, int, int]:
+        if battery_level >= 0.750:
+            return (0, 255, 0)
+        elif battery_level >= 0.500:
+            return (255, 255, 0)
+        elif battery_level >= 0:
+            return (255, 165, 0)
+        else:
+            return (255, 0, 0)
+
+    def update_sensors_layer(self):
+        # A camada só é refeita quando alguma cor de bateria muda. Os círculos se sobrepõem, então ela é
+        # redesenhada inteira, na ordem dos ids, para manter a mesma sobreposição do desenho original.
+        batteries = self.snapshot.batteries
+        is_base_station = self.snapshot.network.store.is_base_station
+        colors = [None if is_base_station[sensor_id] else self.battery_color(batteries[sensor_id]) for sensor_id in range(len(self.sensor_colors))]
+        if colors == self.sensor_colors:
             return
-        
-        for sensor_id in self.simulation.network.sensors:
-            sensor = self.simulation.network.sensors[sensor_id]
-
-            if sensor.is_base_station:
-                base_station = sensor
-
-            if not sensor.is_base_station:
-                x, y = sensor.position
-                screen_x = int(round((x / 1000) * self.screen.get_width()))
-                screen_y = int(round((y / 1000) * self.screen.get_height()))
-                battery_level = sensor.battery
-
-                # Desenhar o raio de alcance
-                if self.display_radius:
-                    range_radius_on_screen = int(round((sensor.range_radius / 1000) * self.screen.get_width()))
-                    pygame.draw.circle(self.screen, (0, 0, 255), (screen_x, screen_y), range_radius_on_screen, 1)
-
-                # Desenhar o sensor
-                if battery_level >= 0.750:
-                    red = 0
-                    green = 255
-                    blue = 0
-                elif battery_level >= 0.500:
-                    red = 255
-                    green = 255
-                    blue = 0
-                elif battery_level >= 0:
-                    red = 255
-                    green = 165
-                    blue = 0
-                else:
-                    red = 255
-                    green = 0
-                    blue = 0
-            
-                sensor_color = (red, green, blue)
-                pygame.draw.circle(self.screen, sensor_color, (screen_x, screen_y), 10)
-
-        x, y = base_station.position
-        screen_x = int(round((x / 1000) * self.screen.get_width()))
-        screen_y = int(round((y / 1000) * self.screen.get_height()))
-        pygame.draw.circle(self.screen, (0, 0, 255), (screen_x, screen_y), 8)
+
+        self.sensor_colors = colors
+        self.sensors_layer.fill((0, 0, 0, 0))
+        for sensor_id, color in enumerate(colors):
+            if color is not None:
+                pygame.draw.circle(self.sensors_layer, color, (self.screen_xs[sensor_id], self.screen_ys[sensor_id]), 10)
+
+    def draw_sensors(self):
+        if self.display_radius:
+            self.screen.blit(self.radius_layer, (0, 0))
+        self.screen.blit(self.sensors_layer, (0, 0))
+
+        # A estação base fica sempre por cima dos sensores
+        for sensor_id in self.base_station_ids:
+            pygame.draw.circle(self.screen, (0, 0, 255), (self.screen_xs[sensor_id], self.screen_ys[sensor_id]), 8)
     
     def draw_paths(self):
-        if self.simulation.network is None or not self.display_paths:
+        if not self.display_paths:
             return
-        for sensor_id in self.simulation.current_paths:
-            path = self.simulation.current_paths[sensor_id]
-            visited = set()
-
-            for i in range(len(path)):
-                if i == 0:
-                    continue
-                
-                if (path[i - 1], path[i]) in visited:
-                    continue
-
-                sensor1 = self.simulation.network.sensors[path[i - 1]]
-                sensor2 = self.simulation.network.sensors[path[i]]
-                visited.add((sensor1.identifier, sensor2.identifier))
-
-                x1, y1 = sensor1.position
-                x2, y2 = sensor2.position
-                screen_x1 = int(round((x1 / 1000) * self.screen.get_width()))
-                screen_y1 = int(round((y1 / 1000) * self.screen.get_height()))
-                screen_x2 = int(round((x2 / 1000) * self.screen.get_width()))
-                screen_y2 = int(round((y2 / 1000) * self.screen.get_height()))
-                pygame.draw.line(self.screen, (0, 0, 0), (screen_x1, screen_y1), (screen_x2, screen_y2), 1)
-        
+        self.screen.blit(self.paths_layer, (0, 0))
     
     def draw_communication_lines(self):
-        if self.simulation.network is None or self.display_paths:
+        if self.display_paths:
             return
-        
-        for sensor_1_id in range(self.simulation.network.qtd_sensors):
-            sensor1 = self.simulation.network.sensors[sensor_1_id]
-
-            for sensor_2_id in range(self.simulation.network.qtd_sensors):
-                sensor2 = self.simulation.network.sensors[sensor_2_id]
-
-                if sensor1.can_communicate_with(sensor2):
-                    x1, y1 = sensor1.position
-                    x2, y2 = sensor2.position
-                    screen_x1 = int(round((x1 / 1000) * self.screen.get_width()))
-                    screen_y1 = int(round((y1 / 1000) * self.screen.get_height()))
-                    screen_x2 = int(round((x2 / 1000) * self.screen.get_width()))
-                    screen_y2 = int(round((y2 / 1000) * self.screen.get_height()))
-                    pygame.draw.line(self.screen, (0, 0, 0), (screen_x1, screen_y1), (screen_x2, screen_y2), 1)
+        self.screen.blit(self.links_layer, (0, 0))
 
     def __del__(self):
+        self.worker.stop()
         pygame.quit()
 
 if __name__ == "__main__":
@@ -153,5 +208,5 @@ if __name__ == "__main__":
 
     simulation = Simulation()
 
-    visualizer = Screen(width=600, height=600, bg_color=(255, 255, 255), simulation=simulation)
+    visualizer = Screen(width=600, height=600, bg_color=(255, 255, 255), simulation=simulation, epochs_per_second=10)
     visualizer.run()
\ No newline at end of file